@@ -1,5 +1,27 @@
 import datetime
+import functools
+import heapq
 import math
+import operator
+import sys
+
+# Number of days in each month of a common year and of a leap year
+DAYS_IN_MONTH = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+DAYS_IN_MONTH_LEAP = (31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+def is_leap_year(year: int) -> bool:
+    '''Checks if year is a leap year'''
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+# Last year covered by DAYS_IN_MONTH_TABLE (the last year datetime supports)
+TABLE_MAX_YEAR = 9999
+
+# Number of days of every month of every year from 0 to TABLE_MAX_YEAR. The
+# days of month m (1 to 12) of year y are DAYS_IN_MONTH_TABLE[12*y + m - 1].
+# Computing it once means validating a date is a single lookup.
+DAYS_IN_MONTH_TABLE = b"".join(
+    bytes(DAYS_IN_MONTH_LEAP if is_leap_year(year) else DAYS_IN_MONTH)
+    for year in range(TABLE_MAX_YEAR + 1))
 
 def check_valid_date(year: int, month: int, day: int):
     '''
@@ -13,36 +35,367 @@ def check_valid_date(year: int, month: int, day: int):
         # Month must be between 1 to 12
         return False
 
-    # Initialise a list that stores the number of days in each month
-    days_in_month = [31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
+    if year <= TABLE_MAX_YEAR:
+        # Since year and month have already been checked before, if the day
+        # is valid the date would be valid
+        return 1 <= day <= DAYS_IN_MONTH_TABLE[12*year + month - 1]
+
+    # Years after the table still follow the leap year rule
+    if is_leap_year(year):
+        return 1 <= day <= DAYS_IN_MONTH_LEAP[month-1]
+    return 1 <= day <= DAYS_IN_MONTH[month-1]
+
+def validate_dates(years, months, days) -> list[int]:
+    '''
+    Validates a whole column of dates at once, for example the birth dates
+    of a csv import. years, months and days are sequences of the same length
+    where row i holds the i-th date. Returns the rows whose date is not
+    valid, so that callers can report them instead of stopping.
+    '''
+    table = DAYS_IN_MONTH_TABLE
+    return [row for row, (year, month, day) in enumerate(zip(years, months, days))
+            if not (0 < year <= TABLE_MAX_YEAR and 1 <= month <= 12
+                    and 1 <= day <= table[12*year + month - 1])
+            and not check_valid_date(year, month, day)]
+
+
+# Date (day, month, year) on which the ages of students are computed, unless
+# another reference date is given
+AGE_REFERENCE_DATE = (1, 1, 2025)
+
+@functools.lru_cache(maxsize=1 << 16)
+def age_on(birth_date: tuple, reference_date: tuple) -> int:
+    '''
+    Returns the age in years on reference_date (day, month, year) of someone
+    born on birth_date (year, month, day), or -1 if reference_date is not a
+    valid date or comes before birth_date.
+
+    Results are memoized. A roster only has a few thousand different birth
+    dates, so most students reuse an age that has already been computed.
+    '''
+    curr_day, curr_month, curr_year = reference_date
+
+    # First check if the date supplied is a valid date
+    if not check_valid_date(curr_year, curr_month, curr_day):
+        return -1
+
+    # Now if the date supplied occurs before the current date, it is invalid
+    current_date = datetime.date(curr_year, curr_month, curr_day)
+    birth_date = datetime.date(*birth_date)
+
+    if current_date < birth_date:
+        # Invalid input
+        return -1
+
+    # According to Piazza discussion @414_f21, the suggested way for
+    # calculating age is using datetime and mathfloor
+
+    # Calculate the number of days a person has been alive
+    age_in_days = (current_date - birth_date).days
+
+    # Return the age in years using math.floor (Each year has 365.25 days)
+    # Comparing months, days and years would give a more accurate age in the
+    # traditional sense. However, this is a acceptable approximation.
+    # Also, the assignment specifies that we have to use math.floor
+    return math.floor(age_in_days/365.25)
+
+def compute_ages(birth_years, birth_months, birth_days,
+                 reference_date: tuple = AGE_REFERENCE_DATE) -> list[int]:
+    '''
+    Returns the age on reference_date (day, month, year) of every birth date
+    given as three columns. Gives the same ages as calculate_age (-1 for a
+    birth date after reference_date), but each different birth date is only
+    turned into a day number once, and the ages are computed from day
+    numbers instead of building datetime.date objects.
+    '''
+    curr_day, curr_month, curr_year = reference_date
+    if not check_valid_date(curr_year, curr_month, curr_day):
+        # Invalid reference date
+        return [-1] * len(birth_years)
+
+    reference_ordinal = datetime.date(curr_year, curr_month, curr_day).toordinal()
+
+    # Maps each birth date seen so far to its age
+    ages = {}
+
+    def age_of(birth_date: tuple) -> int:
+        age = ages.get(birth_date)
+        if age is None:
+            age_in_days = reference_ordinal - datetime.date(*birth_date).toordinal()
+            age = math.floor(age_in_days/365.25) if age_in_days >= 0 else -1
+            ages[birth_date] = age
+        return age
+
+    return [age_of(birth_date) for birth_date in
+            zip(birth_years, birth_months, birth_days)]
+
+
+# Checks used by the schemas of set_values. Each check takes the new value of
+# one attribute and returns True if it is valid.
+
+def type_check(kind: type):
+    '''Returns a check accepting the values of type kind'''
+    return lambda value: type(value) == kind
+
+def range_check(kind: type, low, high):
+    '''Returns a check accepting the values of type kind from low to high'''
+    return lambda value: type(value) == kind and low <= value <= high
+
+def choice_check(*choices: str):
+    '''Returns a check accepting the strings in choices'''
+    choices = frozenset(choices)
+    return lambda value: type(value) == str and value in choices
 
-    if year % 4 == 0 and (year % 100 != 0 or year % 400 == 0):
-        # Year is a leap year, days in February should be 29
-        days_in_month[1] = 29
+def list_check(kind: type):
+    '''Returns a check accepting the lists whose items are all of type kind'''
+    return lambda value: (type(value) == list
+                          and all(type(item) == kind for item in value))
 
-    # Since year and month have already been checked before, if the day is valid
-    # the date would be valid
-    return 1 <= day <= days_in_month[month-1]
+def instance_list_check(cls: type):
+    '''Returns a check accepting the lists of instances of cls'''
+    return lambda value: (type(value) == list
+                          and all(isinstance(item, cls) for item in value))
 
+def agreement_rule(key: str, other_key: str, convert=None):
+    '''
+    Returns a rule rejecting data_attributes that give both key and other_key
+    with contradicting values, that is when convert(data_attributes[key]) (or
+    data_attributes[key] itself if convert is None) differs from
+    data_attributes[other_key].
+    '''
+    def rule(obj, data_attributes: dict) -> bool:
+        if key not in data_attributes or other_key not in data_attributes:
+            return True
+        value = data_attributes[key]
+        if convert is not None:
+            value = convert(value)
+        return value == data_attributes[other_key]
+    return rule
+
+def compile_validator(schema: dict, rules: tuple = (), derived: dict = None):
+    '''
+    Compiles the schema of a class into its validator, a function
+    validate(obj, data_attributes) returning True if set_values can apply
+    data_attributes to obj.
+
+    schema maps every attribute accepted by set_values to its check. rules
+    are the checks that involve several attributes or the current values of
+    obj, called as rule(obj, data_attributes) once the attributes have
+    passed their own checks. data_attributes is read in a single pass that
+    looks up the check of each given attribute, so the cost follows the
+    number of attributes given and not the size of the schema. Attributes
+    that are not in the schema are ignored, as set_values ignores them.
+
+    derived maps an attribute to the attribute it is derived from (see
+    _derived_fields). When both are given, the derived one is replaced by
+    set_values, so only the rules check it.
+    '''
+    checks = dict(schema)
+    derived = derived or {}
+
+    def validate(obj, data_attributes: dict) -> bool:
+        for key, value in data_attributes.items():
+            check = checks.get(key)
+            if check is not None and not check(value):
+                if derived.get(key) in data_attributes:
+                    # Replaced by the value derived from the other attribute
+                    continue
+                return False
+        for rule in rules:
+            if not rule(obj, data_attributes):
+                return False
+        return True
+
+    return validate
+
+def birth_date_rule(participant, data_attributes: dict) -> bool:
+    '''
+    Checks that the birth date of participant stays a valid date once the
+    birth_year, birth_month and birth_day of data_attributes are applied.
+    '''
+    if ("birth_year" not in data_attributes and "birth_month" not in data_attributes
+        and "birth_day" not in data_attributes):
+        # Birth date is not changed
+        return True
+
+    # Construct new birth date and check if it is valid
+    return check_valid_date(
+        data_attributes.get("birth_year", participant._Participant__birth_year),
+        data_attributes.get("birth_month", participant._Participant__birth_month),
+        data_attributes.get("birth_day", participant._Participant__birth_day))
+
+def age_year_rule(student, data_attributes: dict) -> bool:
+    '''
+    Checks that the birth_year of data_attributes can be handled by datetime,
+    which computes the age of a Student and stops at datetime.MAXYEAR.
+    '''
+    return ("birth_year" not in data_attributes
+            or data_attributes["birth_year"] <= datetime.MAXYEAR)
+
+def bulk_set_values(objs, updates) -> list[int]:
+    '''
+    Applies updates[i] to objs[i] with set_values for every i, for example the
+    score updates of a live event. Each update is checked by the compiled
+    validator of the class of its object, so a typical score update costs a
+    couple of dict lookups. Invalid updates leave their object unchanged and
+    do not stop the others. Returns the positions of the invalid updates.
+    '''
+    invalid = []
+    for position, (obj, data_attributes) in enumerate(zip(objs, updates)):
+        if obj.set_values(data_attributes) == -1:
+            invalid.append(position)
+    return invalid
+
+
+class Observable:
+    # Attributes are stored in __slots__ instead of a __dict__ in the whole
+    # hierarchy, which makes large rosters much smaller (see
+    # benchmark_participant_memory). Private names are mangled in __slots__
+    # like everywhere else, so "__observers" is stored as _Observable__observers.
+    __slots__ = ("__observers", "__values")
+
+    def __init__(self):
+        '''
+        Constructs an Observable object.
+
+        Observers (activities keeping a leaderboard, registries keeping
+        indexes) register themselves with _add_observer. set_values calls
+        _notify_observers whenever it changes the object, which calls
+        _observed_changed(obj) on every observer.
+
+        get_values is cached in __values until the object changes.
+        '''
+        # The list is only created when the first observer registers
+        self.__observers = None
+        self.__values = None
+
+    def get_values(self) -> tuple:
+        '''
+        Returns all attributes as a tuple. The tuple is built by _build_values
+        on the first call and then kept until the object changes, so repeated
+        calls do not allocate anything. It is shared between calls and must
+        not be modified.
+        '''
+        values = self.__values
+        if values is None:
+            values = self.__values = self._build_values()
+        return values
+
+    def _add_observer(self, observer) -> None:
+        '''Registers observer to be told when this object changes'''
+        if self.__observers is None:
+            self.__observers = []
+        self.__observers.append(observer)
+
+    def _remove_observer(self, observer) -> None:
+        '''Stops telling observer about changes of this object'''
+        if self.__observers is not None and observer in self.__observers:
+            self.__observers.remove(observer)
+
+    def _notify_observers(self) -> None:
+        '''Tells every registered observer that this object has changed'''
+        # The cached values are out of date
+        self.__values = None
+
+        if self.__observers:
+            for observer in self.__observers:
+                observer._observed_changed(self)
+
+
+class Participant(Observable):
+    __slots__ = ("__name", "__idi", "__birth_year", "__birth_month",
+                 "__birth_day", "__gender")
+
+    # Counts the names changed through set_values. Activities compare it with
+    # the count their cached get_values was built at, so that they follow the
+    # names of their members without observing them.
+    _names_version = 0
+
+    # Attributes returned by get_values, in order. Each subclass adds its own
+    # to the ones of its parent, and _values_getter reads all of them in one
+    # call instead of concatenating a tuple per level of the hierarchy.
+    _value_attributes = ("_Participant__name", "_Participant__idi",
+                         "_Participant__birth_year",
+                         "_Participant__birth_month", "_Participant__birth_day",
+                         "_Participant__gender")
+    _values_getter = operator.attrgetter(*_value_attributes)
+
+    # Checks of the attributes accepted by set_values. Each subclass extends
+    # the _schema and _rules of its parent, and compile_validator turns them
+    # into one _validate per class.
+    _schema = {"name": type_check(str),
+               "idi": type_check(int),
+               "birth_year": type_check(int),
+               "birth_month": type_check(int),
+               "birth_day": type_check(int),
+               "gender": lambda value: (type(value) == str
+                                        and value.lower() in ("male", "female"))}
+    _rules = (birth_date_rule,)
+    _validate = staticmethod(compile_validator(_schema, _rules))
+
+    # Attribute set by each key of set_values
+    _attributes = {"name": "_Participant__name", "idi": "_Participant__idi",
+                   "birth_year": "_Participant__birth_year",
+                   "birth_month": "_Participant__birth_month",
+                   "birth_day": "_Participant__birth_day",
+                   "gender": "_Participant__gender"}
+
+    # Keys linked to another key, with the conversion from one to the other.
+    # When only one of them is given, the other follows it.
+    _mirrors = {}
+
+    # Linked keys that follow the key they are derived from when both are
+    # given, such as performance_level and talent_score for an Artist
+    _derived_fields = {}
+
+    # Keys whose change makes the cached score and eligibility out of date
+    _score_fields = frozenset()
+
+    # Keys that always count as changed, because their value is a list that
+    # could have been changed in place
+    _replaced_fields = frozenset()
 
-class Participant:
     def __init__(self, name: str, idi: int, birth_year: int, birth_month: int,
                  birth_day: int, gender: str):
         '''
         Constructs a Participant object
         Attributes other than name and idi have been made private.
         '''
-        self.name = name
-        self.idi = idi
+        super().__init__()
+
+        self.__name = name
+        self.__idi = idi
         self.__birth_year = birth_year
         self.__birth_month = birth_month
         self.__birth_day = birth_day
         self.__gender = gender
 
-    def get_values(self) -> None:
+    @property
+    def name(self) -> str:
+        '''
+        name and idi stay public. Assigning them works like set_values: the
+        cached get_values is cleared and the observers are told.
+        '''
+        return self.__name
+
+    @name.setter
+    def name(self, name: str) -> None:
+        self.__name = name
+        Participant._names_version += 1
+        self._notify_observers()
+
+    @property
+    def idi(self) -> int:
+        return self.__idi
+
+    @idi.setter
+    def idi(self, idi: int) -> None:
+        self.__idi = idi
+        self._notify_observers()
+
+    def _build_values(self) -> tuple:
         '''Returns all attributes of the participant as a tuple'''
-        return (self.name, self.idi, self.__birth_year, self.__birth_month,
-                self.__birth_day, self.__gender)
+        return self._values_getter(self)
 
     def show_values(self)  -> None:
         '''Prints all details of Participant for easy human-readable display'''
@@ -64,94 +417,128 @@ class Participant:
         data_attributes that are not inside the class, they can be ignored.
 
         Hence, other data_attributes have been ignored.
+
+        The checks are the _schema and _rules of the class, compiled once into
+        _validate. The attributes are then set in one pass by _assign_values and
+        the derived attributes are updated once by _update_derived, so the
+        subclasses do not override set_values but extend these tables.
         '''
-        check_name = ("name" not in data_attributes
-                         or type(data_attributes["name"]) == str)
-                         
-        check_idi = ("idi" not in data_attributes
-                        or type(data_attributes["idi"]) == int)
+        if not self._validate(self, data_attributes):
+            # Invalid input
+            return -1
 
-        # To check valid birth date, first the types of the inputs are checked
-        check_birth_year = ("birth_year" not in data_attributes
-                               or type(data_attributes["birth_year"]) == int)
+        changed, score_changed = self._assign_values(data_attributes)
+        self._update_derived(data_attributes, changed, score_changed)
 
-        check_birth_month = ("birth_month" not in data_attributes
-                                or type(data_attributes["birth_month"]) == int)
+    def _assign_values(self, data_attributes: dict) -> tuple:
+        '''
+        Sets the attributes given in data_attributes, which have already been
+        validated. Returns (changed, score_changed): whether any attribute
+        changed and whether one of the _score_fields changed.
+        '''
+        attributes = self._attributes
+        mirrors = self._mirrors
+        derived_fields = self._derived_fields
+        score_fields = self._score_fields
+        replaced_fields = self._replaced_fields
+        changed = False
+        score_changed = False
+
+        for key, value in data_attributes.items():
+            attribute = attributes.get(key)
+            if attribute is None:
+                # Not an attribute of the class, ignored
+                continue
+
+            mirror = mirrors.get(key)
+            if mirror is not None and derived_fields.get(key) in data_attributes:
+                # Both linked attributes are given. They agree (see
+                # agreement_rule) and this one is set from the other one.
+                continue
+
+            if mirror is not None:
+                # The other linked attribute follows this one
+                other_key, convert = mirror
+                other_value = value if convert is None else convert(value)
+                updates = ((key, attribute, value),
+                           (other_key, attributes[other_key], other_value))
+            else:
+                updates = ((key, attribute, value),)
 
-        check_birth_day = ("birth_day" not in data_attributes
-                                or type(data_attributes["birth_day"]) == int)
+            for field, target, new_value in updates:
+                if field in replaced_fields or getattr(self, target) != new_value:
+                    setattr(self, target, new_value)
+                    changed = True
+                    if field in score_fields:
+                        score_changed = True
+                    elif field == "name":
+                        Participant._names_version += 1
 
-        # Check if birth date has been changed
-        check_birth_date_changed = ("birth_year" in data_attributes
-                                    or "birth_month" in data_attributes
-                                    or "birth_day" in data_attributes)
-        
-        # Initially assume that new birth date is valid
-        check_valid_birth_date = True
-        
-        if check_birth_date_changed:
-            # Birth date has been changed. Construct new birth date and check if
-            # it is valid
-            new_birth_year = data_attributes.get("birth_year", self.__birth_year)
-            new_birth_month = data_attributes.get("birth_month", self.__birth_month)
-            new_birth_day = data_attributes.get("birth_day", self.__birth_day)
-            check_valid_birth_date = check_valid_date(new_birth_year, new_birth_month, new_birth_day)
-
-        check_gender = ("gender" not in data_attributes
-                        or (type(data_attributes["gender"]) == str
-                            and (data_attributes["gender"].lower() == "male"
-                                or data_attributes["gender"].lower() == "female")))
-
-        if not all([check_name, check_idi, check_birth_year, check_birth_month,
-                    check_birth_day, check_valid_birth_date, check_gender]):
-            # Invalid input
-            return -1
+        return (changed, score_changed)
 
-        # Update values
-        self.name = data_attributes.get("name", self.name)
-        self.idi = data_attributes.get("idi", self.idi)
-        self.__birth_year = data_attributes.get("birth_year", self.__birth_year)
-        self.__birth_month = data_attributes.get("birth_month", self.__birth_month)
-        self.__birth_day = data_attributes.get("birth_day", self.__birth_day)
-        self.__gender = data_attributes.get("gender", self.__gender)
+    def _update_derived(self, data_attributes: dict, changed: bool,
+                        score_changed: bool) -> None:
+        '''
+        Updates the derived attributes after _assign_values and tells the
+        observers about the change. A Participant has no derived attributes.
+        '''
+        if changed:
+            self._notify_observers()
 
     def calculate_age(self, curr_day: int, curr_month: int, curr_year: int):
         '''Computes age using the current date. Returns age in years.'''
-        
-        # First check if the date supplied is a valid date
-        if not check_valid_date(curr_year, curr_month, curr_day):
-            return -1
-
-        # Now if the date supplied occurs before the current date, it is invalid
-        current_date = datetime.date(curr_year, curr_month, curr_day)
-        birth_date = datetime.date(self.__birth_year, self.__birth_month, self.__birth_day)
-        
-        if current_date < birth_date:
-            # Invalid input
-            return -1
-
-        # According to Piazza discussion @414_f21, the suggested way for
-        # calculating age is using datetime and mathfloor
-        
-        # Calculate the number of days a person has been alive
-        age_in_days = (current_date - birth_date).days
-
-        # Return the age in years using math.floor (Each year has 365.25 days)
-        # Comparing months, days and years would give a more accurate age in the
-        # traditional sense. However, this is a acceptable approximation.
-        # Also, the assignment specifies that we have to use math.floor
-        return math.floor(age_in_days/365.25)
+        return age_on((self.__birth_year, self.__birth_month, self.__birth_day),
+                      (curr_day, curr_month, curr_year))
 
 
 class Student(Participant):
+    __slots__ = ("__reference_date", "__grade_level", "__class_assigned", "__gpa",
+                 "__selected_activity", "__talent_score", "__athletic_score",
+                 "__leadership_score", "__dirty", "__score", "__age",
+                 "__eligible")
+
+    _value_attributes = Participant._value_attributes + (
+        "_Student__age", "_Student__grade_level", "_Student__class_assigned",
+        "_Student__gpa", "_Student__selected_activity", "_Student__talent_score",
+        "_Student__athletic_score", "_Student__leadership_score",
+        "_Student__eligible")
+    _values_getter = operator.attrgetter(*_value_attributes)
+
+    _schema = {**Participant._schema,
+               # Grade level should be between 1 and 12
+               "grade_level": range_check(int, 1, 12),
+               "class_assigned": type_check(str),
+               # GPA cannot be more than 10 or less than 0
+               "gpa": range_check(float, 0.0, 10.0),
+               "selected_activity": choice_check("Sports", "Talent", "Academic"),
+               "talent_score": type_check(float),
+               "athletic_score": type_check(float),
+               "leadership_score": type_check(float)}
+    _rules = Participant._rules + (age_year_rule,)
+    _validate = staticmethod(compile_validator(_schema, _rules))
+
+    _attributes = {**Participant._attributes,
+                   "grade_level": "_Student__grade_level",
+                   "class_assigned": "_Student__class_assigned",
+                   "gpa": "_Student__gpa",
+                   "selected_activity": "_Student__selected_activity",
+                   "talent_score": "_Student__talent_score",
+                   "athletic_score": "_Student__athletic_score",
+                   "leadership_score": "_Student__leadership_score"}
+    _score_fields = frozenset({"gpa"})
+
     def __init__(self, name: str, idi: int, birth_year: int, birth_month: int,
                  birth_day: int, gender: str, grade_level: int,
                  class_assigned: str, gpa: float, selected_activity: str,
                  talent_score: float, athletic_score: float,
-                 leadership_score: float):
+                 leadership_score: float, *,
+                 reference_date: tuple = AGE_REFERENCE_DATE):
         # Construct using parent class first
         super().__init__(name, idi, birth_year, birth_month, birth_day, gender)
 
+        # Date (day, month, year) on which age is computed
+        self.__reference_date = reference_date
+
         # Add the new variables
         self.__grade_level = grade_level
         self.__class_assigned = class_assigned
@@ -161,36 +548,44 @@ class Student(Participant):
         self.__athletic_score = athletic_score
         self.__leadership_score = leadership_score
 
+        # Eligibility and score are cached. __dirty is True when the cached
+        # eligibility is out of date and __score is None until the score has
+        # been computed.
+        self.__dirty = True
+        self.__score = None
+
         # Add the derived variables
-        self.__age = self.calculate_age(1, 1, 2025)
+        self.__age = self.calculate_age(*reference_date)
         self.is_eligible()
 
+    def _invalidate_cache(self) -> None:
+        '''
+        Marks the cached eligibility and score as out of date. Called by
+        set_values when an attribute they depend on changes.
+        '''
+        self.__dirty = True
+        self.__score = None
+        self._notify_observers()
+
     def is_eligible(self) -> bool:
         '''Calculates eligibility based on GPA and updates eligible feature'''
+        if not self.__dirty:
+            # Nothing has changed since the last call
+            return self.__eligible
+
         # Determine if student is eligible
         eligible = self.__gpa >= 5.0
 
         # Update the eligible feature
         self.__eligible = eligible
+        self.__dirty = False
+
+        # get_values may have been cached with the old eligibility
+        self._Observable__values = None
 
         # Return the eligibility
         return eligible
 
-    def get_values(self) -> tuple:
-        '''Returns all inherited and new attributes as a tuple'''
-
-        # Get the inherited_attributes
-        inherited_attributes = super().get_values()
-
-        # Make a tuple of new attributes
-        new_attributes = (self.__age, self.__grade_level, self.__class_assigned,
-                          self.__gpa, self.__selected_activity,
-                          self.__talent_score, self.__athletic_score,
-                          self.__leadership_score, self.__eligible)
-
-        # Return the combined attributes
-        return inherited_attributes + new_attributes
-
     def show_values(self) -> None:
         '''Prints all the student details, including those from Participant'''
 
@@ -208,76 +603,53 @@ class Student(Participant):
         print(f"Leadership Score:\t{self.__leadership_score}")
         print(f"Eligible:\t{self.__eligible}")
 
-    def set_values(self, data_attributes: dict) -> None:
-        '''Sets both inherited and new attributes and updates derived attributes.'''
+    def _update_derived(self, data_attributes: dict, changed: bool,
+                        score_changed: bool) -> None:
+        '''
+        Updates the derived attributes age and eligible after _assign_values,
+        once however many attributes were set.
+        '''
         # According to Piazza discussion @414_f27 contradicting values won't be
         # passed in data_attributes, so we can just ignore if any "age"
-        # or "eligible" parameter is passed and hence the below code is no
-        # longer needed.
-        # if "age" in data_attributes or "eligible" in data_attributes:
-        #     # age and eligible are derived attributes calculated using
-        #     # calculate_age and is_eligible respectively and cannot be just set
-        #     # using set_values
-        #     return -1
-
-        # First check if the new attributes are valid attributes or not
-        
-        # Grade level should be between 1 and 12
-        check_grade_level = ("grade_level" not in data_attributes
-                             or (type(data_attributes["grade_level"]) == int
-                                 and 1 <= data_attributes["grade_level"] <= 12))
-
-        check_class_assigned = ("class_assigned" not in data_attributes
-                                or type(data_attributes["class_assigned"]) == str)
-
-        # GPA cannot be more than 10 or less than 0
-        check_gpa = ("gpa" not in data_attributes
-                     or (type(data_attributes["gpa"]) == float
-                         and 0.0 <= data_attributes["gpa"] <= 10.0))
-
-        # selected_activity must be one of "Sports", "Talent", "Academic"
-        check_selected_activity = ("selected_activity" not in data_attributes
-                                   or (type(data_attributes["selected_activity"]) == str
-                                       and (data_attributes["selected_activity"] == "Sports"
-                                            or data_attributes["selected_activity"] == "Talent"
-                                            or data_attributes["selected_activity"] == "Academic")))
-
-        check_talent_score = ("talent_score" not in data_attributes
-                              or type(data_attributes["talent_score"]) == float)
-
-        check_athletic_score = ("athletic_score" not in data_attributes
-                                or type(data_attributes["athletic_score"]) == float)
-
-        check_leadership_score = ("leadership_score" not in data_attributes
-                                  or type(data_attributes["leadership_score"]) == float)
-
-        if not all([check_grade_level, check_class_assigned, check_gpa,
-                    check_selected_activity, check_talent_score,
-                    check_athletic_score, check_leadership_score]):
-            # Invalid input
-            return -1
-
-        # Set inherited values. If this returns -1, then new values for inherited
-        # values are not correct
-        if super().set_values(data_attributes) == -1:
-            return -1
-
-        # If code reaches here, it means that inherited values have been set
-        # Now set the new attributes
-        self.__grade_level = data_attributes.get("grade_level", self.__grade_level)
-        self.__class_assigned = data_attributes.get("class_assigned", self.__class_assigned)
-        self.__gpa = data_attributes.get("gpa", self.__gpa)
-        self.__selected_activity = data_attributes.get("selected_activity", self.__selected_activity)
-        self.__talent_score = data_attributes.get("talent_score", self.__talent_score)
-        self.__athletic_score = data_attributes.get("athletic_score", self.__athletic_score)
-        self.__leadership_score = data_attributes.get("leadership_score", self.__leadership_score)
-
-        # Update the derived attributes age and eligible
-        self.__age = self.calculate_age(1, 1, 2025)
+        # or "eligible" parameter is passed.
+
+        # Age only changes with the birth date
+        if ("birth_year" in data_attributes or "birth_month" in data_attributes
+            or "birth_day" in data_attributes):
+            old_age = self.__age
+            self.__age = self.calculate_age(*self.__reference_date)
+            if self.__age != old_age:
+                score_changed = True
+
+        if score_changed:
+            self._invalidate_cache()
+        elif changed:
+            self._notify_observers()
         self.is_eligible()
 
 
 class Teacher(Participant):
+    __slots__ = ("__subject", "__mentor_grade", "__mentor_class", "__judge")
+
+    _value_attributes = Participant._value_attributes + (
+        "_Teacher__subject", "_Teacher__mentor_grade", "_Teacher__mentor_class",
+        "_Teacher__judge")
+    _values_getter = operator.attrgetter(*_value_attributes)
+
+    _schema = {**Participant._schema,
+               "subject": type_check(str),
+               # Mentor grade should be between 1 and 12
+               "mentor_grade": range_check(int, 1, 12),
+               "mentor_class": type_check(str),
+               "judge": type_check(bool)}
+    _validate = staticmethod(compile_validator(_schema, Participant._rules))
+
+    _attributes = {**Participant._attributes,
+                   "subject": "_Teacher__subject",
+                   "mentor_grade": "_Teacher__mentor_grade",
+                   "mentor_class": "_Teacher__mentor_class",
+                   "judge": "_Teacher__judge"}
+
     def __init__(self, name: str, idi: int, birth_year: int, birth_month: int,
                  birth_day: int, gender: str, subject: str, mentor_grade: int,
                  mentor_class: str, judge: bool):
@@ -290,22 +662,6 @@ class Teacher(Participant):
         self.__mentor_class = mentor_class
         self.__judge = judge
 
-    def get_values(self) -> tuple:
-        '''
-        Retrieves all the teacher’s details along with inherited
-        participant details
-        '''
-
-        # Get the inherited_attributes
-        inherited_attributes = super().get_values()
-
-        # Make a tuple of new attributes
-        new_attributes = (self.__subject, self.__mentor_grade,
-                          self.__mentor_class, self.__judge)
-
-        # Return the combined attributes
-        return inherited_attributes + new_attributes
-
     def show_values(self) -> None:
         '''Displays all the teacher’s details in a user-friendly format.'''
 
@@ -318,53 +674,43 @@ class Teacher(Participant):
         print(f"Mentor Class:\t{self.__mentor_class}")
         print(f"Judge:\t\t{self.__judge}")
 
-    def set_values(self, data_attributes: dict) -> None:
-        '''Sets both inherited and new attributes'''
-
-        # First check if the new attributes are valid attributes or not
-
-        check_subject = ("subject" not in data_attributes
-                         or type(data_attributes["subject"]) == str)
-
-        # Mentor grade should be between 1 and 12
-        check_mentor_grade = ("mentor_grade" not in data_attributes
-                              or (type(data_attributes["mentor_grade"]) == int
-                                  and 1 <= data_attributes["mentor_grade"] <= 12))
-
-        check_mentor_class = ("mentor_class" not in data_attributes
-                              or type(data_attributes["mentor_class"]) == str)
-
-        check_judge = ("judge" not in data_attributes
-                        or type(data_attributes["judge"]) == bool)
-
-        if not all([check_subject, check_mentor_grade, check_mentor_class,
-                    check_judge]):
-            # Invalid input
-            return -1
-
-        # Set inherited values. If this returns -1, then new values for inherited
-        # values are not correct
-        if super().set_values(data_attributes) == -1:
-            return -1
-
-        # If code reaches here, it means that inherited values have been set
-        # Now set the new attributes
-        self.__subject = data_attributes.get("subject", self.__subject)
-        self.__mentor_grade = data_attributes.get("mentor_grade", self.__mentor_grade)
-        self.__mentor_class = data_attributes.get("mentor_class", self.__mentor_class)
-        self.__judge = data_attributes.get("judge", self.__judge)
-
 
 class Artist(Student):
+    __slots__ = ("__performance_level", "__talent")
+
+    _value_attributes = Student._value_attributes + (
+        "_Artist__performance_level", "_Artist__talent")
+    _values_getter = operator.attrgetter(*_value_attributes)
+
+    _schema = {**Student._schema,
+               "performance_level": type_check(float),
+               "talent": type_check(str),
+               # For Artist, the selected_activity should be Talent
+               "selected_activity": choice_check("Talent")}
+    # talent_score and performance_level cannot contradict each other
+    _rules = Student._rules + (agreement_rule("talent_score", "performance_level"),)
+    _derived_fields = {"performance_level": "talent_score"}
+    _validate = staticmethod(compile_validator(_schema, _rules, _derived_fields))
+
+    _attributes = {**Student._attributes,
+                   "performance_level": "_Artist__performance_level",
+                   "talent": "_Artist__talent"}
+    # If the performance_level changes, the talent_score changes accordingly
+    _mirrors = {"talent_score": ("performance_level", None),
+                "performance_level": ("talent_score", None)}
+    _score_fields = Student._score_fields | {"performance_level"}
+
     def __init__(self, name: str, idi: int, birth_year: int, birth_month: int,
                  birth_day: int, gender: str, grade_level: int,
                  class_assigned: str, gpa: float, selected_activity: str,
                  talent_score: float, athletic_score: float,
-                 leadership_score: float, talent: str):
+                 leadership_score: float, talent: str, *,
+                 reference_date: tuple = AGE_REFERENCE_DATE):
         # Construct using parent class first
         super().__init__(name, idi, birth_year, birth_month, birth_day, gender,
                          grade_level, class_assigned, gpa, selected_activity,
-                         talent_score, athletic_score, leadership_score)
+                         talent_score, athletic_score, leadership_score,
+                         reference_date=reference_date)
 
         # Add the new attributes
         # It is given that performance_level is same as talent_score
@@ -373,41 +719,42 @@ class Artist(Student):
 
     def compute_scores(self) -> float:
         '''Returns the score of the student if the student is eligible'''
-        
+        if self._Student__score is not None:
+            # Score has not changed since the last call
+            return self._Student__score
+
         if self.is_eligible():
             # Student is eligible. Their score is their performance level.
-            return self.__performance_level
+            score = self.__performance_level
         else:
             # Student is not eligible. Fail condition
-            return -1
-        
+            score = -1
+
+        self._Student__score = score
+        return score
+
     def is_eligible(self) -> bool:
         '''
         Calculates eligibility based on GPA and age and sets the value of data
         member eligible.
         '''
+        if not self._Student__dirty:
+            # Nothing has changed since the last call
+            return self._Student__eligible
+
         # Determine if student is eligible
         eligible = self._Student__gpa > 6.0 and self._Student__age >= 16
 
         # Update the eligible feature
         self._Student__eligible = eligible
+        self._Student__dirty = False
+
+        # get_values may have been cached with the old eligibility
+        self._Observable__values = None
 
         # Return the eligibility
         return eligible
 
-    def get_values(self) -> tuple:
-        '''
-        Retrieves all artist details along with inherited participant details.
-        '''
-        # Get the inherited_attributes
-        inherited_attributes = super().get_values()
-
-        # Make a tuple of new attributes
-        new_attributes = (self.__performance_level, self.__talent)
-
-        # Return the combined attributes
-        return inherited_attributes + new_attributes
-
     def show_values(self) -> None:
         '''Displays all attributes details in a user-friendly format.'''
         # Print artist details from Student
@@ -417,61 +764,47 @@ class Artist(Student):
         print(f"Performance level:\t{self.__performance_level}")
         print(f"Talent:\t\t{self.__talent}")
 
-    def set_values(self, data_attributes: dict) -> None:
-        '''Sets both inherited and new attributes.'''
-        # First make sure contradicting values are not given
-        if ("talent_score" in data_attributes
-            and "performance_level" in data_attributes
-            and data_attributes["talent_score"] != data_attributes["performance_level"]):
-            # Invalid input
-            return -1
-
-        # This new_data_attributes will be passed along to the parent class and hence
-        # if the performance_level changes, the talent_score should change accordingly
-        new_data_attributes = data_attributes.copy()
-        if "talent_score" in data_attributes:
-            new_data_attributes["performance_level"] = data_attributes["talent_score"]
-        elif "performance_level" in data_attributes:
-            new_data_attributes["talent_score"] = data_attributes["performance_level"]
-
-        
-        # Now check if the new attributes are valid attributes or not
-        check_performance_level = ("performance_level" not in new_data_attributes
-                              or type(new_data_attributes["performance_level"]) == float)
-        
-        check_talent = ("talent" not in new_data_attributes
-                        or type(new_data_attributes["talent"]) == str)
-
-        # Also, for Artist, the selected_activity should be Talent
-        check_selected_activity = ("selected_activity" not in new_data_attributes
-                                   or new_data_attributes["selected_activity"] == "Talent")
-        
-        if not all([check_performance_level, check_talent, check_selected_activity]):
-            # Invalid input
-            return -1
-
-        # Set inherited values. If this returns -1, then new values for
-        # inherited values are not correct
-        if super().set_values(new_data_attributes) == -1:
-            return -1
-
-        # If code reaches here, it means that inherited values have been set
-        # Now set the new attributes
-        self.__performance_level = new_data_attributes.get("performance_level", self.__performance_level)
-        self.__talent = new_data_attributes.get("talent", self.__talent)
-        
 
 class Athlete(Student):
+    __slots__ = ("__sports_category", "__fitness_score", "__performance_level")
+
+    _value_attributes = Student._value_attributes + (
+        "_Athlete__sports_category", "_Athlete__fitness_score",
+        "_Athlete__performance_level")
+    _values_getter = operator.attrgetter(*_value_attributes)
+
+    _schema = {**Student._schema,
+               "sports_category": type_check(str),
+               "fitness_score": type_check(float),
+               "performance_level": type_check(float),
+               # For Athlete, the selected_activity should be Sports
+               "selected_activity": choice_check("Sports")}
+    # athletic_score and performance_level cannot contradict each other
+    _rules = Student._rules + (agreement_rule("athletic_score", "performance_level"),)
+    _derived_fields = {"performance_level": "athletic_score"}
+    _validate = staticmethod(compile_validator(_schema, _rules, _derived_fields))
+
+    _attributes = {**Student._attributes,
+                   "sports_category": "_Athlete__sports_category",
+                   "fitness_score": "_Athlete__fitness_score",
+                   "performance_level": "_Athlete__performance_level"}
+    # If the performance_level changes, the athletic_score changes accordingly
+    _mirrors = {"athletic_score": ("performance_level", None),
+                "performance_level": ("athletic_score", None)}
+    _score_fields = Student._score_fields | {"fitness_score", "performance_level"}
+
     def __init__(self, name: str, idi: int, birth_year: int, birth_month: int,
                  birth_day: int, gender: str, grade_level: int,
                  class_assigned: str, gpa: float, selected_activity: str,
                  talent_score: float, athletic_score: float,
                  leadership_score: float, sports_category: str,
-                 fitness_score: float):
+                 fitness_score: float, *,
+                 reference_date: tuple = AGE_REFERENCE_DATE):
         # Construct using parent class first
         super().__init__(name, idi, birth_year, birth_month, birth_day, gender,
                          grade_level, class_assigned, gpa, selected_activity,
-                         talent_score, athletic_score, leadership_score)
+                         talent_score, athletic_score, leadership_score,
+                         reference_date=reference_date)
 
         # Add the new attributes
         self.__sports_category = sports_category
@@ -482,43 +815,43 @@ class Athlete(Student):
 
     def compute_scores(self) -> float:
         '''Returns the score of the student if the student is eligible'''
-        
+        if self._Student__score is not None:
+            # Score has not changed since the last call
+            return self._Student__score
+
         if self.is_eligible():
             # Student is eligible. Their score is their fitness_score times the
             # performance_level.
-            return self.__fitness_score * self.__performance_level
+            score = self.__fitness_score * self.__performance_level
         else:
             # Student is not eligible. Fail condition
-            return -1
-        
+            score = -1
+
+        self._Student__score = score
+        return score
+
     def is_eligible(self) -> bool:
         '''
         Calculates eligibility based on GPA and age and sets the value of data
         member eligible.
         '''
+        if not self._Student__dirty:
+            # Nothing has changed since the last call
+            return self._Student__eligible
+
         # Determine if student is eligible
         eligible = self._Student__gpa > 5.5 and self._Student__age >= 12
 
         # Update the eligible feature
         self._Student__eligible = eligible
+        self._Student__dirty = False
+
+        # get_values may have been cached with the old eligibility
+        self._Observable__values = None
 
         # Return the eligibility
         return eligible
 
-    def get_values(self) -> tuple:
-        '''
-        Retrieves all athlete details along with inherited participant details.
-        '''
-        # Get the inherited_attributes
-        inherited_attributes = super().get_values()
-
-        # Make a tuple of new attributes
-        new_attributes = (self.__sports_category, self.__fitness_score,
-                          self.__performance_level)
-
-        # Return the combined attributes
-        return inherited_attributes + new_attributes
-
     def show_values(self) -> None:
         '''Displays all attributes details in a user-friendly format.'''
         # Print athlete details from Student
@@ -529,69 +862,55 @@ class Athlete(Student):
         print(f"Fitness Score:\t{self.__fitness_score}")
         print(f"Performance level:\t{self.__performance_level}")
 
-    def set_values(self, data_attributes: dict) -> None:
-        '''Sets both inherited and new attributes.'''
-        # First make sure contradicting values are not given
-        if ("athletic_score" in data_attributes
-            and "performance_level" in data_attributes
-            and data_attributes["athletic_score"] != data_attributes["performance_level"]):
-            # Invalid input
-            return -1
-
-        # This new_data_attributes will be passed along to the parent class and hence
-        # if the performance_level changes, the athletic_score should change accordingly
-        new_data_attributes = data_attributes.copy()
-        if "athletic_score" in data_attributes:
-            new_data_attributes["performance_level"] = data_attributes["athletic_score"]
-        elif "performance_level" in data_attributes:
-            new_data_attributes["athletic_score"] = data_attributes["performance_level"]
-
-        
-        # Now check if the new attributes are valid attributes or not
-        check_sports_category = ("sports_category" not in new_data_attributes
-                        or type(new_data_attributes["sports_category"]) == str)
-
-        check_fitness_score = ("fitness_score" not in new_data_attributes
-                              or type(new_data_attributes["fitness_score"]) == float)
-        
-        check_performance_level = ("performance_level" not in new_data_attributes
-                              or type(new_data_attributes["performance_level"]) == float)
-        
-
-        # Also, for Athlete, the selected_activity should be Sports
-        check_selected_activity = ("selected_activity" not in new_data_attributes
-                                   or new_data_attributes["selected_activity"] == "Sports")
-        
-        if not all([check_sports_category, check_fitness_score,
-                    check_performance_level, check_selected_activity]):
-            # Invalid input
-            return -1
-
-        # Set inherited values. If this returns -1, then new values for
-        # inherited values are not correct
-        if super().set_values(new_data_attributes) == -1:
-            return -1
-
-        # If code reaches here, it means that inherited values have been set
-        # Now set the new attributes
-        self.__sports_category = new_data_attributes.get("sports_category", self.__sports_category)
-        self.__fitness_score = new_data_attributes.get("fitness_score", self.__fitness_score)
-        self.__performance_level = new_data_attributes.get("performance_level", self.__performance_level)
-        
 
 class Scholar(Student):
+    __slots__ = ("__olympiad_scores", "__subject_specialization",
+                 "__performance_level")
+
+    _value_attributes = Student._value_attributes + (
+        "_Scholar__subject_specialization", "_Scholar__olympiad_scores",
+        "_Scholar__performance_level")
+    _values_getter = operator.attrgetter(*_value_attributes)
+
+    _schema = {**Student._schema,
+               "subject_specialization": type_check(str),
+               "olympiad_scores": list_check(float),
+               # performance_level is GPA * 10, so the GPA it gives must be
+               # valid too
+               "performance_level": lambda value: (type(value) == float
+                                                   and 0.0 <= value / 10 <= 10.0),
+               # For Scholar, the selected_activity should be Academic
+               "selected_activity": choice_check("Academic")}
+    # gpa and performance_level cannot contradict each other
+    _rules = Student._rules + (
+        agreement_rule("gpa", "performance_level", lambda gpa: gpa * 10),)
+    _derived_fields = {"performance_level": "gpa"}
+    _validate = staticmethod(compile_validator(_schema, _rules, _derived_fields))
+
+    _attributes = {**Student._attributes,
+                   "subject_specialization": "_Scholar__subject_specialization",
+                   "olympiad_scores": "_Scholar__olympiad_scores",
+                   "performance_level": "_Scholar__performance_level"}
+    # If the performance_level changes, the gpa changes accordingly
+    _mirrors = {"gpa": ("performance_level", lambda gpa: gpa * 10),
+                "performance_level": ("gpa", lambda level: level / 10)}
+    _score_fields = Student._score_fields | {"olympiad_scores", "performance_level"}
+    _replaced_fields = frozenset({"olympiad_scores"})
+
     def __init__(self, name: str, idi: int, birth_year: int, birth_month: int,
                  birth_day: int, gender: str, grade_level: int,
                  class_assigned: str, gpa: float, selected_activity: str,
                  talent_score: float, athletic_score: float,
                  leadership_score: float, subject_specialization: str,
-                 olympiad_scores: list[float]):
+                 olympiad_scores: list[float], *,
+                 reference_date: tuple = AGE_REFERENCE_DATE):
         self.__olympiad_scores = olympiad_scores
         
         # Construct using parent class
         super().__init__(name, idi, birth_year, birth_month, birth_day, gender,
                          grade_level, class_assigned, gpa, selected_activity,
-                         talent_score, athletic_score, leadership_score)
+                         talent_score, athletic_score, leadership_score,
+                         reference_date=reference_date)
 
         # Add the new attributes
         self.__subject_specialization = subject_specialization
@@ -601,43 +920,44 @@ class Scholar(Student):
 
     def compute_scores(self) -> float:
         '''Returns the score of the student if the student is eligible'''
+        if self._Student__score is not None:
+            # Score has not changed since the last call
+            return self._Student__score
+
         if self.is_eligible():
             # Student is eligible. Their score is their olympiad_scores times
             # the performance_level.
-            return sum(self.__olympiad_scores) * self.__performance_level
+            score = sum(self.__olympiad_scores) * self.__performance_level
         else:
             # Student is not eligible. Fail condition
-            return -1
-        
+            score = -1
+
+        self._Student__score = score
+        return score
+
     def is_eligible(self) -> bool:
         '''
         Calculates eligibility based on GPA, olympiad_scores and age and sets
         the value of data member eligible.
         '''
+        if not self._Student__dirty:
+            # Nothing has changed since the last call
+            return self._Student__eligible
+
         # Determine if student is eligible
         eligible = (self._Student__gpa > 8.0 and self._Student__age >= 10
                     and any([score > 80 for score in self.__olympiad_scores]))
 
         # Update the eligible feature
         self._Student__eligible = eligible
+        self._Student__dirty = False
+
+        # get_values may have been cached with the old eligibility
+        self._Observable__values = None
 
         # Return the eligibility
         return eligible
 
-    def get_values(self) -> tuple:
-        '''
-        Retrieves all academic details along with inherited participant details.
-        '''
-        # Get the inherited_attributes
-        inherited_attributes = super().get_values()
-
-        # Make a tuple of new attributes
-        new_attributes = (self.__subject_specialization, self.__olympiad_scores,
-                          self.__performance_level)
-
-        # Return the combined attributes
-        return inherited_attributes + new_attributes
-
     def show_values(self) -> None:
         '''Displays all attributes details in a user-friendly format.'''
         # Print scholar details from Student
@@ -648,59 +968,38 @@ class Scholar(Student):
         print(f"Olympiad Scores:\t{self.__olympiad_scores}")
         print(f"Performance level:\t{self.__performance_level}")
 
-    def set_values(self, data_attributes: dict) -> None:
-        '''Sets both inherited and new attributes.'''
-        # First make sure contradicting values are not given
-        if ("gpa" in data_attributes
-            and "performance_level" in data_attributes
-            and data_attributes["gpa"] * 10 != data_attributes["performance_level"]):
-            # Invalid input
-            return -1
-
-        # This new_data_attributes will be passed along to the parent class and hence
-        # if the performance_level changes, the gpa should change accordingly
-        new_data_attributes = data_attributes.copy()
-        if "gpa" in data_attributes:
-            new_data_attributes["performance_level"] = data_attributes["gpa"] * 10
-        elif "performance_level" in data_attributes:
-            new_data_attributes["gpa"] = data_attributes["performance_level"] / 10
-
-        
-        # Now check if the new attributes are valid attributes or not
-        check_subject_specialization = ("subject_specialization" not in new_data_attributes
-                        or type(new_data_attributes["subject_specialization"]) == str)
-
-        check_olympiad_scores = ("olympiad_scores" not in new_data_attributes
-                              or (type(new_data_attributes["olympiad_scores"]) == list
-                                  and all([type(i) == float for i in new_data_attributes["olympiad_scores"]])))
-        
-        
-        check_performance_level = ("performance_level" not in new_data_attributes
-                              or type(new_data_attributes["performance_level"]) == float)
-        
-
-        # Also, for Scholar, the selected_activity should be Academic
-        check_selected_activity = ("selected_activity" not in new_data_attributes
-                                   or new_data_attributes["selected_activity"] == "Academic")
-        
-        if not all([check_subject_specialization, check_olympiad_scores,
-                    check_performance_level, check_selected_activity]):
-            # Invalid input
-            return -1
-
-        # Set inherited values. If this returns -1, then new values for
-        # inherited values are not correct
-        if super().set_values(new_data_attributes) == -1:
-            return -1
 
-        # If code reaches here, it means that inherited values have been set
-        # Now set the new attributes
-        self.__subject_specialization = new_data_attributes.get("subject_specialization", self.__subject_specialization)
-        self.__olympiad_scores = new_data_attributes.get("olympiad_scores", self.__olympiad_scores)
-        self.__performance_level = new_data_attributes.get("performance_level", self.__performance_level)
-        
+class Activity(Observable):
+    __slots__ = ("__activity_id", "__activity_name", "__activity_type",
+                 "__max_participants", "__grade_level", "__is_active",
+                 "__participants", "__organizers", "__participant_ids",
+                 "__organizer_ids", "__leaderboard", "__leaderboard_entries",
+                 "__leaderboard_sequence", "__observing", "__lock",
+                 "__names_version")
+
+    # Attributes returned by get_values, in order. The participants and
+    # organizers are replaced by their names.
+    _value_attributes = ("_Activity__activity_id", "_Activity__activity_name",
+                         "_Activity__activity_type",
+                         "_Activity__max_participants", "_Activity__grade_level",
+                         "_Activity__is_active", "_Activity__participants",
+                         "_Activity__organizers")
+    _values_getter = operator.attrgetter(*_value_attributes)
+
+    # Class of the participants accepted by add_participant
+    participant_class = Student
+
+    # Checks of the attributes accepted by set_values, see Participant
+    _schema = {"activity_id": type_check(int),
+               "activity_name": type_check(str),
+               "activity_type": choice_check("Sports", "Talent", "Academic"),
+               "max_participants": type_check(int),
+               "grade_level": type_check(int),
+               "is_active": type_check(bool),
+               "participants": instance_list_check(participant_class),
+               "organizers": instance_list_check(Teacher)}
+    _validate = staticmethod(compile_validator(_schema))
 
-class Activity:
     def __init__(self, activity_id: int, activity_name: str, activity_type: str,
                  max_participants: int, grade_level: int, is_active: bool,
                  participants: list[Student], organizers: list[Teacher]):
@@ -709,90 +1008,455 @@ class Activity:
         Attributes other than activity_id and activity_name have been made
         private.
         '''
-        self.activity_id = activity_id
-        self.activity_name = activity_name
+        super().__init__()
+
+        self.__activity_id = activity_id
+        self.__activity_name = activity_name
         self.__activity_type = activity_type
         self.__max_participants = max_participants
         self.__grade_level = grade_level
         self.__is_active = is_active
-        self.__participants = participants
-        self.__organizers = organizers
+        # Copies, so that adding participants or organizers later does not
+        # change the lists of the caller
+        self.__participants = list(participants)
+        self.__organizers = list(organizers)
+
+        # id() of every participant and organizer, to find duplicates in O(1)
+        self.__participant_ids = {id(p) for p in participants}
+        self.__organizer_ids = {id(o) for o in organizers}
+
+        # Optional leaderboard, see enable_leaderboard
+        self.__leaderboard = None
+        self.__leaderboard_entries = None
+        self.__leaderboard_sequence = 0
+
+        # True while the activity observes its participants, see
+        # enable_leaderboard
+        self.__observing = False
+
+        # Participant._names_version when get_values was last cached
+        self.__names_version = Participant._names_version
+
+        # Lock taken when a participant tells the activity about a change,
+        # set by a ConcurrentRegistry. None when the activity is not shared
+        # between threads.
+        self.__lock = None
+
+    @property
+    def activity_id(self) -> int:
+        '''
+        activity_id and activity_name stay public. Assigning them clears the
+        cached get_values and tells the observers, like set_values.
+        '''
+        return self.__activity_id
 
-    def get_values(self) -> tuple:
-        '''Return all attributes of the activity as a tuple.'''
+    @activity_id.setter
+    def activity_id(self, activity_id: int) -> None:
+        self.__activity_id = activity_id
+        self._notify_observers()
 
-        # Converts the students and teachers to their names for readability
-        return (self.activity_id, self.activity_name, self.__activity_type,
-                self.__max_participants, self.__grade_level, self.__is_active,
-                [st.name for st in self.__participants],
-                [te.name for te in self.__organizers])
+    @property
+    def activity_name(self) -> str:
+        return self.__activity_name
 
-    def show_values(self) -> None:
+    @activity_name.setter
+    def activity_name(self, activity_name: str) -> None:
+        self.__activity_name = activity_name
+        self._notify_observers()
+
+    def __observe_participants(self) -> None:
         '''
-        Prints all the activity details in a user-friendly format.
+        Registers the activity as an observer of its participants, so that
+        the leaderboard hears about their score changes.
         '''
-        print(f"Activity ID:\t\t{self.activity_id}")
-        print(f"Activity Name:\t\t{self.activity_name}")
-        print(f"Activity Type:\t\t{self.__activity_type}")
-        print(f"Max Participants:\t{self.__max_participants}")
-        print(f"Grade Level:\t\t{self.__grade_level}")
-        print(f"Active:\t\t\t{self.__is_active}")
-        print(f"Participants:\t\t{[st.name for st in self.__participants]}")
-        print(f"Organizers:\t\t{[te.name for te in self.__organizers]}")
-
-    def set_values(self, data_attributes: dict) -> None:
-        '''Sets attributes'''
-        # First check if the attributes provided are correct
-        check_activity_id = ("activity_id" not in data_attributes
-                             or type(data_attributes["activity_id"]) == int)
+        if self.__observing:
+            return
 
-        check_activity_name = ("activity_name" not in data_attributes
-                             or type(data_attributes["activity_name"]) == str)
+        self.__observing = True
+        for participant in {id(p): p for p in self.__participants}.values():
+            participant._add_observer(self)
 
-        check_activity_type = ("activity_type" not in data_attributes
-                                or (type(data_attributes["activity_type"]) == str
-                                    and (data_attributes["activity_type"] == "Sports"
-                                        or data_attributes["activity_type"] == "Talent"
-                                        or data_attributes["activity_type"] == "Academic")))
+    def __unobserve_participants(self) -> None:
+        '''Stops observing the participants, see __observe_participants'''
+        if not self.__observing:
+            return
 
-        check_max_participants = ("max_participants" not in data_attributes
-                             or type(data_attributes["max_participants"]) == int)
+        self.__observing = False
+        for participant in {id(p): p for p in self.__participants}.values():
+            participant._remove_observer(self)
 
-        check_grade_level = ("grade_level" not in data_attributes
-                             or type(data_attributes["grade_level"]) == int)
+    def enable_leaderboard(self) -> None:
+        '''
+        Starts keeping an incremental leaderboard of the participants.
+
+        The leaderboard is a heap of [-score, idi, sequence, participant]
+        entries, so its first entry is always the current winner. Participants
+        tell the activity when their score changes and the activity pushes a
+        new entry for them in O(log n). Their old entry is not searched for
+        but marked as removed by setting its participant to None, and it is
+        dropped once it reaches the top of the heap.
+        '''
+        if self.__leaderboard is not None:
+            # Already enabled
+            return
+
+        self.__observe_participants()
+        self.__leaderboard = []
+        self.__leaderboard_entries = {}
+        for participant in self.__participants:
+            if id(participant) not in self.__leaderboard_entries:
+                self.__leaderboard_push(participant)
+
+    def disable_leaderboard(self) -> None:
+        '''
+        Stops keeping the leaderboard and observing the participants.
+        '''
+        if self.__leaderboard is None:
+            # Already disabled
+            return
+
+        self.__leaderboard = None
+        self.__leaderboard_entries = None
+        self.__unobserve_participants()
+
+    def __leaderboard_push(self, participant: Student) -> None:
+        '''Adds participant to the leaderboard if they are eligible'''
+        self.__leaderboard_sequence += 1
+        entry = [-participant.compute_scores(), participant.idi,
+                 self.__leaderboard_sequence, participant]
+
+        # Ineligible participants stay in the entries, so that they keep
+        # being observed, but they are never pushed on the heap
+        self.__leaderboard_entries[id(participant)] = entry
+        if participant.is_eligible():
+            heapq.heappush(self.__leaderboard, entry)
+
+        if len(self.__leaderboard) > 2 * len(self.__leaderboard_entries) + 16:
+            # Too many removed entries are waiting to reach the top. Rebuild
+            # the heap so that it does not keep growing.
+            self.__leaderboard = [e for e in self.__leaderboard if e[3] is not None]
+            heapq.heapify(self.__leaderboard)
+
+    def __leaderboard_remove(self, participant: Student) -> None:
+        '''Marks the entry of participant as removed'''
+        entry = self.__leaderboard_entries.pop(id(participant))
+        entry[3] = None
+
+    def _observed_changed(self, participant: Student) -> None:
+        '''Called by a participant that changed'''
+        if self.__lock is None:
+            self.__member_changed(participant)
+        else:
+            with self.__lock:
+                self.__member_changed(participant)
 
-        check_is_active = ("is_active" not in data_attributes
-                         or type(data_attributes["is_active"]) == bool)
+    def __member_changed(self, participant: Student) -> None:
+        '''Updates the leaderboard after a change'''
+        if self.__leaderboard is None or id(participant) not in self.__leaderboard_entries:
+            return
 
-        check_participants = ("participants" not in data_attributes
-                             or (type(data_attributes["participants"]) == list
-                                 and all([isinstance(p, Student) for p in data_attributes["participants"]])))
+        self.__leaderboard_remove(participant)
+        self.__leaderboard_push(participant)
 
-        check_organizers = ("organizers" not in data_attributes
-                             or (type(data_attributes["organizers"]) == list
-                                 and all([isinstance(o, Teacher) for o in data_attributes["organizers"]])))
+    def _leaderboard_winner(self) -> Student:
+        '''
+        Returns the participant at the top of the leaderboard, or -1 if no
+        participant is eligible.
+        '''
+        leaderboard = self.__leaderboard
 
+        # Drop the entries that have been replaced or removed
+        while leaderboard and leaderboard[0][3] is None:
+            heapq.heappop(leaderboard)
 
-        if not all([check_activity_id, check_activity_name, check_activity_type,
-                    check_max_participants, check_grade_level, check_is_active,
-                    check_participants, check_organizers]):
-            # Invalid input
+        if len(leaderboard) == 0:
+            # Fail condition
             return -1
 
-        # Update Values
-        self.activity_id = data_attributes.get("activity_id", self.activity_id)
-        self.activity_name = data_attributes.get("activity_name", self.activity_name)
-        self.__activity_type = data_attributes.get("activity_type", self.__activity_type)
-        self.__max_participants = data_attributes.get("max_participants", self.__max_participants)
-        self.__grade_level = data_attributes.get("grade_level", self.__grade_level)
-        self.__is_active = data_attributes.get("is_active", self.__is_active)
-        self.__participants = data_attributes.get("participants", self.__participants)
-        self.__organizers = data_attributes.get("organizers", self.__organizers)
-        
+        return leaderboard[0][3]
 
-class SportsTournament(Activity):
-    def __init__(self, activity_id: int, activity_name: str, activity_type: str,
-                 max_participants: int, grade_level: int, is_active: bool,
+    def add_participant(self, participant: Student) -> None:
+        '''
+        Adds one participant. Only the new participant is checked, so adding
+        participants one at a time costs O(1) each instead of revalidating the
+        whole list like set_values. Returns -1 if participant has the wrong
+        class or is already a participant.
+        '''
+        return self.add_participants_bulk([participant])
+
+    def add_participants_bulk(self, participants: list[Student]) -> None:
+        '''
+        Adds several participants at once. All of them are checked before any
+        is added, so either all are added or, if one of them has the wrong
+        class or is already a participant (or given twice), none is and -1 is
+        returned.
+        '''
+        new_ids = set()
+        for participant in participants:
+            if (not isinstance(participant, self.participant_class)
+                or id(participant) in self.__participant_ids
+                or id(participant) in new_ids):
+                # Invalid input
+                return -1
+            new_ids.add(id(participant))
+
+        if not participants:
+            return
+
+        self.__participants.extend(participants)
+        self.__participant_ids |= new_ids
+
+        if self.__observing:
+            for participant in participants:
+                participant._add_observer(self)
+
+        if self.__leaderboard is not None:
+            for participant in participants:
+                self.__leaderboard_push(participant)
+
+        self._notify_observers()
+
+    def remove_participant(self, participant: Student) -> None:
+        '''Removes one participant. Returns -1 if it is not a participant.'''
+        if id(participant) not in self.__participant_ids:
+            # Invalid input
+            return -1
+
+        self.__participants.remove(participant)
+        self.__participant_ids.discard(id(participant))
+
+        if self.__observing:
+            participant._remove_observer(self)
+
+        if self.__leaderboard is not None:
+            self.__leaderboard_remove(participant)
+
+        self._notify_observers()
+
+    def add_organizer(self, organizer: Teacher) -> None:
+        '''
+        Adds one organizer. Returns -1 if organizer is not a Teacher or is
+        already an organizer.
+        '''
+        return self.add_organizers_bulk([organizer])
+
+    def add_organizers_bulk(self, organizers: list[Teacher]) -> None:
+        '''
+        Adds several organizers at once. Either all are added or, if one of
+        them is not a Teacher or is already an organizer, none is and -1 is
+        returned.
+        '''
+        new_ids = set()
+        for organizer in organizers:
+            if (not isinstance(organizer, Teacher)
+                or id(organizer) in self.__organizer_ids
+                or id(organizer) in new_ids):
+                # Invalid input
+                return -1
+            new_ids.add(id(organizer))
+
+        if not organizers:
+            return
+
+        self.__organizers.extend(organizers)
+        self.__organizer_ids |= new_ids
+
+        self._notify_observers()
+
+    def remove_organizer(self, organizer: Teacher) -> None:
+        '''Removes one organizer. Returns -1 if it is not an organizer.'''
+        if id(organizer) not in self.__organizer_ids:
+            # Invalid input
+            return -1
+
+        self.__organizers.remove(organizer)
+        self.__organizer_ids.discard(id(organizer))
+
+        self._notify_observers()
+
+    def __ranking_keys(self, class_assigned: str = None) -> list:
+        '''
+        Returns a (-score, idi, position) tuple for every eligible participant,
+        optionally only for the ones in class_assigned. Sorting the tuples
+        orders the participants like determine_winner does.
+        '''
+        return [(-p.compute_scores(), p.idi, position)
+                for position, p in enumerate(self.__participants)
+                if p.is_eligible() and (class_assigned is None
+                                        or p._Student__class_assigned == class_assigned)]
+
+    def rank(self, k: int = None, class_assigned: str = None) -> list:
+        '''
+        Returns the eligible participants from best to worst, with the same
+        order as determine_winner (highest score first, then lowest idi).
+
+        If k is given only the top k participants are returned. They are
+        picked with a heap (heapq.nsmallest) in O(n log k) instead of sorting
+        the whole field. If class_assigned is given only participants of that
+        class are ranked, which gives the podium of each class.
+        Returns -1 if k is invalid.
+        '''
+        if k is not None and (type(k) != int or k < 0):
+            # Invalid input
+            return -1
+
+        keys = self.__ranking_keys(class_assigned)
+        if k is None:
+            keys.sort()
+        else:
+            keys = heapq.nsmallest(k, keys)
+
+        return [self.__participants[position] for _, _, position in keys]
+
+    def iter_rank(self, class_assigned: str = None):
+        '''
+        Yields the eligible participants from best to worst, one at a time.
+
+        The ranking keys are turned into a heap in O(n) and each participant
+        costs one O(log n) pop, so paging through the first few pages of a
+        very large field never sorts all of it.
+        '''
+        keys = self.__ranking_keys(class_assigned)
+        heapq.heapify(keys)
+        while keys:
+            _, _, position = heapq.heappop(keys)
+            yield self.__participants[position]
+
+    def get_values(self) -> tuple:
+        '''
+        Return all attributes of the activity as a tuple. It is cached like
+        the values of participants, and rebuilt when a participant or an
+        organizer has been renamed since (see Participant._names_version).
+        Reading it never registers the activity with its members.
+        '''
+        names_version = Participant._names_version
+        if self.__names_version != names_version:
+            # Recorded before the names are read, so that a rename made while
+            # building the values invalidates them again
+            self.__names_version = names_version
+            self._Observable__values = None
+        return super().get_values()
+
+    def _cached_values(self) -> tuple:
+        '''Returns the cached get_values if it is up to date, otherwise None'''
+        if self.__names_version != Participant._names_version:
+            return None
+        return self._Observable__values
+
+    def _build_values(self) -> tuple:
+        '''Return all attributes of the activity as a tuple.'''
+        values = list(self._values_getter(self))
+
+        # Converts the students and teachers to their names for readability
+        values[6] = [st.name for st in values[6]]
+        values[7] = [te.name for te in values[7]]
+        return tuple(values)
+
+    def show_values(self) -> None:
+        '''
+        Prints all the activity details in a user-friendly format.
+        '''
+        print(f"Activity ID:\t\t{self.activity_id}")
+        print(f"Activity Name:\t\t{self.activity_name}")
+        print(f"Activity Type:\t\t{self.__activity_type}")
+        print(f"Max Participants:\t{self.__max_participants}")
+        print(f"Grade Level:\t\t{self.__grade_level}")
+        print(f"Active:\t\t\t{self.__is_active}")
+        print(f"Participants:\t\t{[st.name for st in self.__participants]}")
+        print(f"Organizers:\t\t{[te.name for te in self.__organizers]}")
+
+    def set_values(self, data_attributes: dict) -> None:
+        '''
+        Sets attributes. They are first checked by _validate, compiled from
+        the _schema of the class, then set by _apply_values.
+        '''
+        if not self._validate(self, data_attributes):
+            # Invalid input
+            return -1
+
+        if self._apply_values(data_attributes):
+            self._notify_observers()
+
+    def _apply_values(self, data_attributes: dict) -> bool:
+        '''
+        Sets the attributes given in data_attributes, which have already been
+        validated. Returns True if the activity changed.
+        '''
+        old_values = (self.activity_id, self.activity_name, self.__activity_type,
+                      self.__max_participants, self.__grade_level,
+                      self.__is_active)
+
+        # Update Values
+        self.__activity_id = data_attributes.get("activity_id", self.__activity_id)
+        self.__activity_name = data_attributes.get("activity_name",
+                                                   self.__activity_name)
+        self.__activity_type = data_attributes.get("activity_type", self.__activity_type)
+        self.__max_participants = data_attributes.get("max_participants", self.__max_participants)
+        self.__grade_level = data_attributes.get("grade_level", self.__grade_level)
+        self.__is_active = data_attributes.get("is_active", self.__is_active)
+        if self.__observing and "participants" in data_attributes:
+            # Only the participants that were added or removed change observers
+            old_members = {id(m): m for m in self.__participants}
+            new_members = {id(m): m for m in data_attributes["participants"]}
+
+            for key, member in old_members.items():
+                if key not in new_members:
+                    member._remove_observer(self)
+
+            for key, member in new_members.items():
+                if key not in old_members:
+                    member._add_observer(self)
+
+        if "organizers" in data_attributes:
+            # Copied like in the constructor
+            self.__organizers = list(data_attributes["organizers"])
+            self.__organizer_ids = {id(o) for o in self.__organizers}
+
+        if "participants" in data_attributes and self.__leaderboard is not None:
+            # Only the participants that were added or removed touch the
+            # leaderboard
+            old_participants = {id(p): p for p in self.__participants}
+            new_participants = {id(p): p for p in data_attributes["participants"]}
+
+            for key, participant in old_participants.items():
+                if key not in new_participants:
+                    self.__leaderboard_remove(participant)
+
+            for key, participant in new_participants.items():
+                if key not in old_participants:
+                    self.__leaderboard_push(participant)
+
+        if "participants" in data_attributes:
+            self.__participants = list(data_attributes["participants"])
+            self.__participant_ids = {id(p) for p in self.__participants}
+
+        return ("participants" in data_attributes or "organizers" in data_attributes
+                or old_values != (self.activity_id, self.activity_name,
+                                  self.__activity_type, self.__max_participants,
+                                  self.__grade_level, self.__is_active))
+        
+
+class SportsTournament(Activity):
+    __slots__ = ("__game_type", "__duration_minutes")
+
+    _value_attributes = Activity._value_attributes + (
+        "_SportsTournament__game_type", "_SportsTournament__duration_minutes")
+    _values_getter = operator.attrgetter(*_value_attributes)
+
+    # Class of the participants accepted by add_participant
+    participant_class = Athlete
+
+    _schema = {**Activity._schema,
+               "game_type": choice_check("Team", "Individual"),
+               "duration_minutes": type_check(int),
+               # All participants should be Athletes
+               "participants": instance_list_check(participant_class),
+               # Activity type should be Sports
+               "activity_type": choice_check("Sports")}
+    _validate = staticmethod(compile_validator(_schema))
+
+    def __init__(self, activity_id: int, activity_name: str, activity_type: str,
+                 max_participants: int, grade_level: int, is_active: bool,
                  participants: list[Athlete], organizers: list[Teacher],
                  game_type: str, duration_minutes: int):
         # Construct using parent class first
@@ -811,56 +1475,17 @@ class SportsTournament(Activity):
             return -1
         
         if self.__game_type == "Individual":
-            valid_participants = [p for p in participants if p.is_eligible()]
-            if len(valid_participants) == 0:
-                # Fail condition
-                return -1
-            
-            return max(valid_participants, key = lambda p: [p.compute_scores(), -p.idi])
+            if self._Activity__leaderboard is not None:
+                return self._leaderboard_winner()
+            return winner_from_participants(participants)
         
         elif self.__game_type == "Team":
-            teams = {}
-            for athlete in participants:
-                if athlete.is_eligible():
-                    teams.setdefault(athlete._Student__class_assigned, [])
-                    teams[athlete._Student__class_assigned].append(athlete)
-
-            if len(teams) == 0:
-                # Fail Condition
-                return -1
-            
-            best_team = None
-            best_team_avg = None
-            for team_name in teams:
-                team = teams[team_name]
-
-                # Compute the team average
-                team_avg = sum([p.compute_scores() for p in team])/len(team)
-
-                # Update the best team if this team has better average
-                if best_team_avg is None or team_avg > best_team_avg:
-                    best_team = team
-                    best_team_avg = team_avg
-
-            # Return the athlete with highest score in the winning team
-            return max(best_team, key = lambda p: [p.compute_scores(), -p.idi])
+            return team_winner_from_participants(participants)
 
         else:
             # Invalid game type
             return -1
 
-    def get_values(self) -> None:
-        '''Returns all inherited and new attributes as a tuple'''
-
-        # Get the inherited_attributes
-        inherited_attributes = super().get_values()
-
-        # Make a tuple of new attributes
-        new_attributes = (self.__game_type, self.__duration_minutes)
-
-        # Return the combined attributes
-        return inherited_attributes + new_attributes
-
     def show_values(self) -> None:
         '''Prints all the activity details in a user-friendly format.'''
         # Print SportsTournament details from Activity
@@ -870,43 +1495,36 @@ class SportsTournament(Activity):
         print(f"Game Type:\t\t{self.__game_type}")
         print(f"Duration (in min):\t{self.__duration_minutes}")
 
-    def set_values(self, data_attributes: dict) -> None:
+    def _apply_values(self, data_attributes: dict) -> bool:
         '''Sets both inherited and new attributes'''
-        # First check if the attributes provided are correct
-        check_game_type = ("game_type" not in data_attributes
-                            or (type(data_attributes["game_type"]) == str
-                                and (data_attributes["game_type"] == "Team"
-                                    or data_attributes["game_type"] == "Individual")))
-
-        check_duration_minutes = ("duration_minutes" not in data_attributes
-                             or type(data_attributes["duration_minutes"]) == int)
-
-        # All participants should be Athletes
-        check_participants = ("participants" not in data_attributes
-                             or (type(data_attributes["participants"]) == list
-                                 and all([isinstance(p, Athlete) for p in data_attributes["participants"]])))
-
-        # Activity type should be Sports
-        check_activity_type = ("activity_type" not in data_attributes
-                             or data_attributes["activity_type"] == "Sports")
-
-        if not all([check_game_type, check_duration_minutes, check_participants,
-                   check_activity_type]):
-            # Invalid input
-            return -1
+        changed = super()._apply_values(data_attributes)
 
-        # Set inherited values. If this returns -1, then new values for
-        # inherited values are not correct
-        if super().set_values(data_attributes) == -1:
-            return -1
+        old_values = (self.__game_type, self.__duration_minutes)
 
-        # If code reaches here, it means that inherited values have been set
-        # Now set the new attributes
         self.__game_type = data_attributes.get("game_type", self.__game_type)
         self.__duration_minutes = data_attributes.get("duration_minutes", self.__duration_minutes)
+
+        return changed or old_values != (self.__game_type, self.__duration_minutes)
         
 
 class TalentShow(Activity):
+    __slots__ = ("__talent_categories",)
+
+    _value_attributes = Activity._value_attributes + (
+        "_TalentShow__talent_categories",)
+    _values_getter = operator.attrgetter(*_value_attributes)
+
+    # Class of the participants accepted by add_participant
+    participant_class = Artist
+
+    _schema = {**Activity._schema,
+               "talent_categories": list_check(str),
+               # All participants should be Artists
+               "participants": instance_list_check(participant_class),
+               # Activity type should be Talent
+               "activity_type": choice_check("Talent")}
+    _validate = staticmethod(compile_validator(_schema))
+
     def __init__(self, activity_id: int, activity_name: str, activity_type: str,
                  max_participants: int, grade_level: int, is_active: bool,
                  participants: list[Artist], organizers: list[Teacher],
@@ -920,29 +1538,13 @@ class TalentShow(Activity):
         self.__talent_categories = talent_categories
 
     def evaluate_talent(self) -> Artist:
-        participants = self._Activity__participants
-        valid_participants = [p for p in participants if p.is_eligible()]
-        if len(valid_participants) == 0:
-                # Fail condition
-                return -1
-
-        return max(valid_participants, key = lambda p: [p.compute_scores(), -p.idi])
+        if self._Activity__leaderboard is not None:
+            return self._leaderboard_winner()
+        return winner_from_participants(self._Activity__participants)
 
     def determine_winner(self) -> Artist:
         return self.evaluate_talent()
         
-    def get_values(self) -> None:
-        '''Returns all inherited and new attributes as a tuple'''
-
-        # Get the inherited_attributes
-        inherited_attributes = super().get_values()
-
-        # Make a tuple of new attributes
-        new_attributes = (self.__talent_categories,)
-
-        # Return the combined attributes
-        return inherited_attributes + new_attributes
-
     def show_values(self) -> None:
         '''Prints all the activity details in a user-friendly format.'''
         # Print TalentShow details from Activity
@@ -951,38 +1553,34 @@ class TalentShow(Activity):
         # Print the new attributes
         print(f"Talent Categories:\t{self.__talent_categories}")
 
-    def set_values(self, data_attributes: dict) -> None:
+    def _apply_values(self, data_attributes: dict) -> bool:
         '''Sets both inherited and new attributes'''
-        # First check if the attributes provided are correct
-        check_talent_categories = ("talent_categories" not in data_attributes
-                            or (type(data_attributes["talent_categories"]) == list
-                                and all([type(i) == str for i in data_attributes["talent_categories"]])))
-
-        # All participants should be Artists
-        check_participants = ("participants" not in data_attributes
-                             or (type(data_attributes["participants"]) == list
-                                 and all([isinstance(p, Artist) for p in data_attributes["participants"]])))
-
-        # Activity type should be Talent
-        check_activity_type = ("activity_type" not in data_attributes
-                             or data_attributes["activity_type"] == "Talent")
-
-        if not all([check_talent_categories, check_participants,
-                    check_activity_type]):
-            # Invalid input
-            return -1
-
-        # Set inherited values. If this returns -1, then new values for
-        # inherited values are not correct
-        if super().set_values(data_attributes) == -1:
-            return -1
+        changed = super()._apply_values(data_attributes)
 
-        # If code reaches here, it means that inherited values have been set
-        # Now set the new attributes
         self.__talent_categories = data_attributes.get("talent_categories", self.__talent_categories)
+
+        return changed or "talent_categories" in data_attributes
         
 
 class AcademicCompetition(Activity):
+    __slots__ = ("__subjects", "__max_marks")
+
+    _value_attributes = Activity._value_attributes + (
+        "_AcademicCompetition__subjects", "_AcademicCompetition__max_marks")
+    _values_getter = operator.attrgetter(*_value_attributes)
+
+    # Class of the participants accepted by add_participant
+    participant_class = Scholar
+
+    _schema = {**Activity._schema,
+               "subjects": list_check(str),
+               "max_marks": type_check(float),
+               # All participants should be Scholars
+               "participants": instance_list_check(participant_class),
+               # Activity type should be Academic
+               "activity_type": choice_check("Academic")}
+    _validate = staticmethod(compile_validator(_schema))
+
     def __init__(self, activity_id: int, activity_name: str, activity_type: str,
                  max_participants: int, grade_level: int, is_active: bool,
                  participants: list[Scholar], organizers: list[Teacher],
@@ -997,26 +1595,10 @@ class AcademicCompetition(Activity):
         self.__max_marks = max_marks
 
     def determine_winner(self) -> Scholar:
-        participants = self._Activity__participants
-        valid_participants = [p for p in participants if p.is_eligible()]
-        if len(valid_participants) == 0:
-                # Fail condition
-                return -1
-
-        return max(valid_participants, key = lambda p: [p.compute_scores(), -p.idi])
+        if self._Activity__leaderboard is not None:
+            return self._leaderboard_winner()
+        return winner_from_participants(self._Activity__participants)
         
-    def get_values(self) -> None:
-        '''Returns all inherited and new attributes as a tuple'''
-
-        # Get the inherited_attributes
-        inherited_attributes = super().get_values()
-
-        # Make a tuple of new attributes
-        new_attributes = (self.__subjects, self.__max_marks)
-
-        # Return the combined attributes
-        return inherited_attributes + new_attributes
-
     def show_values(self) -> None:
         '''Prints all the activity details in a user-friendly format.'''
         # Print AcademicCompetition details from Activity
@@ -1026,177 +1608,2997 @@ class AcademicCompetition(Activity):
         print(f"Subjects:\t\t{self.__subjects}")
         print(f"Max Marks:\t\t{self.__max_marks}")
 
-    def set_values(self, data_attributes: dict) -> None:
+    def _apply_values(self, data_attributes: dict) -> bool:
         '''Sets both inherited and new attributes'''
-        # First check if the attributes provided are correct
-        check_subjects = ("subjects" not in data_attributes
-                        or (type(data_attributes["subjects"]) == list
-                            and all([type(i) == str for i in data_attributes["subjects"]])))
+        changed = super()._apply_values(data_attributes)
 
-        check_max_marks = ("max_marks" not in data_attributes
-                           or type(data_attributes["max_marks"]) == float)
-        
-        # All participants should be Scholars
-        check_participants = ("participants" not in data_attributes
-                             or (type(data_attributes["participants"]) == list
-                                 and all([isinstance(p, Scholar) for p in data_attributes["participants"]])))
+        old_max_marks = self.__max_marks
+
+        self.__subjects = data_attributes.get("subject", self.__subjects)
+        self.__max_marks = data_attributes.get("max_marks", self.__max_marks)
+
+        return (changed or "subject" in data_attributes
+                or self.__max_marks != old_max_marks)
+###############################################################################
+
+import csv
+import gc
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+# Optional columns of the participant csv file, used to build the specialised
+# students when the students are promoted
+SPECIALIZATION_COLUMNS = ("talent", "sports_category", "fitness_score",
+                          "subject_specialization", "olympiad_scores")
+
+# Class a student is promoted to, depending on their selected_activity
+PROMOTED_CLASSES = {"Sports": Athlete, "Talent": Artist, "Academic": Scholar}
+
+def promoted_student(attributes: tuple, talent: str, sports_category: str,
+                     fitness_score: str, subject_specialization: str,
+                     olympiad_scores: str,
+                     reference_date: tuple = AGE_REFERENCE_DATE) -> Student:
+    '''
+    Builds the specialised student matching the selected_activity in
+    attributes (the arguments of the Student constructor): an Athlete for
+    Sports, an Artist for Talent and a Scholar for Academic. Any other
+    selected_activity gives a plain Student.
+
+    The other arguments are the raw csv fields of the optional
+    SPECIALIZATION_COLUMNS. Missing or empty fields give an empty string,
+    a fitness_score of 0.0 or no olympiad scores. olympiad_scores are
+    separated by "-", like talent_categories in the activities file.
+    '''
+    student_class = PROMOTED_CLASSES.get(attributes[9])
+
+    if student_class is Athlete:
+        return Athlete(*attributes, sports_category or "",
+                       float(fitness_score) if fitness_score else 0.0,
+                       reference_date=reference_date)
 
-        # Activity type should be Academic
-        check_activity_type = ("activity_type" not in data_attributes
-                             or data_attributes["activity_type"] == "Academic")
+    if student_class is Artist:
+        return Artist(*attributes, talent or "", reference_date=reference_date)
 
-        if not all([check_subjects, check_max_marks,
-                    check_participants, check_activity_type]):
+    if student_class is Scholar:
+        scores = [float(score) for score in olympiad_scores.split("-")
+                  if score] if olympiad_scores else []
+        return Scholar(*attributes, subject_specialization or "", scores,
+                       reference_date=reference_date)
+
+    return Student(*attributes, reference_date=reference_date)
+
+def participant_from_row(participant: dict,
+                         reference_date: tuple = AGE_REFERENCE_DATE,
+                         promote: bool = False):
+    '''
+    Builds a Student or a Teacher from one row of the participant csv file.
+    The age of a Student is computed on reference_date (day, month, year).
+    If promote is True, students are directly built as the Athlete, Artist
+    or Scholar matching their selected_activity (see promoted_student).
+    Returns -1 if the row is invalid.
+    '''
+    idi = int(participant["idi"])
+    name = participant["name"]
+    birth_year = int(participant["birth_year"])
+    birth_month = int(participant["birth_month"])
+    birth_day = int(participant["birth_day"])
+    gender = participant["gender"]
+
+    if participant["gpa"]:
+        # participant is a Student. Only students compute an age from their
+        # birth date, so only their birth date has to be valid.
+        if not check_valid_date(birth_year, birth_month, birth_day):
             # Invalid input
             return -1
 
-        # Set inherited values. If this returns -1, then new values for
-        # inherited values are not correct
-        if super().set_values(data_attributes) == -1:
-            return -1
+        athletic_score = float(participant["athletic_score"])
+        leadership_score = float(participant["leadership_score"])
+        talent_score = float(participant["talent_score"])
+        gpa = float(participant["gpa"])
+        class_assigned = participant["class_assigned"]
+        selected_activity = participant["selected_activity"]
+        grade_level = int(participant["grade_level"])
+
+        if promote:
+            attributes = (name, idi, birth_year, birth_month, birth_day,
+                          gender, grade_level, class_assigned, gpa,
+                          selected_activity, talent_score, athletic_score,
+                          leadership_score)
+            return promoted_student(attributes,
+                *[participant.get(column) for column in SPECIALIZATION_COLUMNS],
+                reference_date=reference_date)
+
+        return Student(name, idi, birth_year, birth_month, birth_day, gender,
+                       grade_level, class_assigned, gpa, selected_activity,
+                       talent_score, athletic_score, leadership_score,
+                       reference_date=reference_date)
+
+    # participant is a Teacher
+    subject = participant["subject"]
+    mentor_grade = int(participant["mentor_grade"])
+    mentor_class = participant["mentor_class"]
+    judge = participant["judge"]
+
+    if judge.strip().upper() == "TRUE":
+        judge = True
+    elif judge.strip().upper() == "FALSE":
+        judge = False
+    else:
+        # Invalid input
+        return -1
+
+    return Teacher(name, idi, birth_year, birth_month, birth_day, gender,
+                   subject, mentor_grade, mentor_class, judge)
+
+class RowError:
+    def __init__(self, line_number: int, message: str, row: dict):
+        '''
+        Constructs a RowError, which describes one invalid row of a csv file.
+        line_number is the line of the file the row ends on (the header is
+        line 1) and row holds the row as read from the file.
+        '''
+        self.line_number = line_number
+        self.message = message
+        self.row = row
 
-        # If code reaches here, it means that inherited values have been set
-        # Now set the new attributes
-        self.__subjects = data_attributes.get("subject", self.__subjects)
-        self.__max_marks = data_attributes.get("max_marks", self.__max_marks)
-###############################################################################
+    def __repr__(self) -> str:
+        return f"RowError(line {self.line_number}: {self.message})"
 
-import csv
+def missing_fields_problem(row: dict) -> str:
+    '''
+    Returns the problem of a row that is shorter than the header. csv.DictReader
+    gives None for the fields such a row does not have.
+    '''
+    missing = [column for column, value in row.items() if value is None]
+    return "missing field " + ", ".join(missing)
 
-def load_participant_data(filepath: str):
+def participant_row_problem(participant: dict) -> str:
     '''
-    Loads the participant data and returns a tuple of lists of Students and
-    Teachers
+    Returns why participant_from_row returned -1 for the row participant
+    '''
+    if participant["gpa"]:
+        # Only the birth date of a Student is checked
+        return "invalid birth date"
+
+    return f"judge must be TRUE or FALSE, got {participant['judge']!r}"
+
+def iter_participants(filepath: str, chunk_size: int = None,
+                      reference_date: tuple = AGE_REFERENCE_DATE,
+                      errors: list = None, promote: bool = False):
+    '''
+    Streams the participant data instead of loading the whole file.
+
+    Yields one Student or Teacher at a time while the csv file is being read.
+    If chunk_size is given, yields lists of at most chunk_size participants
+    instead, so that callers can work on fixed-size batches. Only the current
+    row (or the current chunk) is kept in memory.
+
+    Like load_participant_data, an invalid row stops the load. In that case
+    -1 is yielded and the generator finishes. If errors is a list, invalid
+    rows are skipped instead and a RowError is appended to errors for each
+    of them. Ages are computed on reference_date (day, month, year), and
+    promote works like in participant_from_row.
     '''
+    if chunk_size is not None and (type(chunk_size) != int or chunk_size <= 0):
+        # Invalid input
+        yield -1
+        return
+
     with open(filepath, 'r') as f:
-        # Makes a DictReader. This takes the first line (header) of the csv
-        # file and converts it into keys of the dictionary
         reader = csv.DictReader(f)
 
-        # Initialise students and teachers to empty lists
-        students = []
-        teachers = []
-        
-        for participant in reader:
-            idi = int(participant["idi"])
-            name = participant["name"]
-            birth_year = int(participant["birth_year"])
-            birth_month = int(participant["birth_month"])
-            birth_day = int(participant["birth_day"])
-            gender = participant["gender"]
-            
-            if participant["gpa"]:
-                # participant is a Student
-                athletic_score = float(participant["athletic_score"])
-                leadership_score = float(participant["leadership_score"])
-                talent_score = float(participant["talent_score"])
-                gpa = float(participant["gpa"])
-                class_assigned = participant["class_assigned"]
-                selected_activity = participant["selected_activity"]
-                grade_level = int(participant["grade_level"])
-
-                student = Student(name, idi, birth_year, birth_month, birth_day,
-                              gender, grade_level, class_assigned, gpa,
-                              selected_activity, talent_score, athletic_score,
-                              leadership_score)
-                students.append(student)
-
+        chunk = []
+        for row in reader:
+            if errors is None:
+                participant = participant_from_row(row, reference_date, promote)
+                if participant == -1:
+                    # Invalid input, stop reading the file
+                    yield -1
+                    return
             else:
-                # participant is a Teacher
-                subject = participant["subject"]
-                mentor_grade = int(participant["mentor_grade"])
-                mentor_class = participant["mentor_class"]
-                judge = participant["judge"]
-
-                if judge.strip().upper() == "TRUE":
-                    judge = True
-                elif judge.strip().upper() == "FALSE":
-                    judge = False
-                else:
-                    # Invalid input
-                    return -1
+                try:
+                    participant = participant_from_row(row, reference_date, promote)
+                    if participant == -1:
+                        errors.append(RowError(reader.line_num,
+                                               participant_row_problem(row), row))
+                        continue
+                except KeyError as error:
+                    errors.append(RowError(reader.line_num,
+                                           f"missing column {error}", row))
+                    continue
+                except (AttributeError, TypeError):
+                    # A field the row needs is None because the row is short
+                    errors.append(RowError(reader.line_num,
+                                           missing_fields_problem(row), row))
+                    continue
+                except ValueError as error:
+                    # A field is empty or cannot be converted
+                    errors.append(RowError(reader.line_num, str(error), row))
+                    continue
+
+            if chunk_size is None:
+                yield participant
+                continue
+
+            chunk.append(participant)
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+
+        if chunk:
+            # The last chunk can be smaller than chunk_size
+            yield chunk
+
+def load_participant_data(filepath: str,
+                          reference_date: tuple = AGE_REFERENCE_DATE,
+                          promote: bool = False):
+    '''
+    Loads the participant data and returns a tuple of lists of Students and
+    Teachers. Ages are computed on reference_date (day, month, year). If
+    promote is True, the students are built as Athletes, Artists and Scholars
+    according to their selected_activity, reading the optional
+    SPECIALIZATION_COLUMNS.
+    '''
+    # Initialise students and teachers to empty lists
+    students = []
+    teachers = []
 
-                teacher = Teacher(name, idi, birth_year, birth_month, birth_day,
-                                  gender, subject, mentor_grade, mentor_class,
-                                  judge)
+    for participant in iter_participants(filepath, reference_date=reference_date,
+                                         promote=promote):
+        if participant == -1:
+            # Invalid input
+            return -1
 
-                teachers.append(teacher)
+        if isinstance(participant, Student):
+            students.append(participant)
+        else:
+            teachers.append(participant)
 
     # Return in the specified form
     return (students, teachers)
 
-def load_activities_data(filepath: str):
+def import_participant_data(filepath: str,
+                            reference_date: tuple = AGE_REFERENCE_DATE,
+                            promote: bool = False):
     '''
-    Loads the activities data and returns a tuple of lists of SportsTournament,
-    TalentShow and AcademicCompetition.
+    Bulk import version of load_participant_data. Instead of stopping at the
+    first invalid row, invalid rows are skipped and reported. Returns a tuple
+    of the list of Students, the list of Teachers and the list of RowErrors.
+    '''
+    students = []
+    teachers = []
+    errors = []
+
+    for participant in iter_participants(filepath, reference_date=reference_date,
+                                         errors=errors, promote=promote):
+        if isinstance(participant, Student):
+            students.append(participant)
+        else:
+            teachers.append(participant)
+
+    return (students, teachers, errors)
+
+def activity_from_row(activity: dict):
+    '''
+    Builds a SportsTournament, TalentShow or AcademicCompetition from one row
+    of the activities csv file. Returns -1 if the row is invalid.
+    '''
+    activity_id = int(activity["activity_id"])
+    activity_name = activity["activity_name"]
+    activity_type = activity["activity_type"]
+    max_participants = int(activity["max_participants"])
+    grade_level = int(activity["grade_level"])
+
+    # Default values for is_active, participants and organizers
+    is_active = False
+    participants = []
+    organizers = []
+
+    if activity_type == "Sports":
+        # It is a SportsTournament
+        game_type = activity["game_type"]
+        duration_minutes = int(activity["duration_minutes"])
+
+        return SportsTournament(activity_id, activity_name, activity_type,
+                                max_participants, grade_level, is_active,
+                                participants, organizers, game_type,
+                                duration_minutes)
+
+    elif activity_type == "Talent":
+        # It is a TalentShow
+        talent_categories = activity["talent_categories"].split("-")
+
+        return TalentShow(activity_id, activity_name, activity_type,
+                          max_participants, grade_level, is_active,
+                          participants, organizers, talent_categories)
+
+    elif activity_type == "Academic":
+        # It is a AcademicCompetition
+        subjects = activity["subjects"].split("-")
+        max_marks = float(activity["max_marks"])
+
+        return AcademicCompetition(activity_id, activity_name, activity_type,
+                                   max_participants, grade_level, is_active,
+                                   participants, organizers, subjects,
+                                   max_marks)
+
+    else:
+        # Invalid input
+        return -1
+
+def iter_activities(filepath: str, errors: list = None):
+    '''
+    Streams the activities data, yielding one activity at a time while the
+    csv file is being read.
+
+    Like load_activities_data, an invalid row stops the load. In that case -1
+    is yielded and the generator finishes. If errors is a list, invalid rows
+    are skipped instead and a RowError is appended to errors for each of them.
     '''
     with open(filepath, 'r') as f:
         # Makes a DictReader. This takes the first line (header) of the csv
         # file and converts it into keys of the dictionary
         reader = csv.DictReader(f)
 
-        # Initialise sports_tournaments, talent_shows and academic_competitions
-        # to empty lists
-        sports_tournaments = []
-        talent_shows = []
-        academic_competitions = []
-        
-        for activity in reader:
-            activity_id = int(activity["activity_id"])
-            activity_name = activity["activity_name"]
-            activity_type = activity["activity_type"]
-            max_participants = int(activity["max_participants"])
-            grade_level = int(activity["grade_level"])
-
-            # Default values for is_active, participants and organizers
-            is_active = False
-            participants = []
-            organizers = []
+        for row in reader:
+            if errors is None:
+                activity = activity_from_row(row)
+                if activity == -1:
+                    # Invalid input, stop reading the file
+                    yield -1
+                    return
+            else:
+                try:
+                    activity = activity_from_row(row)
+                    if activity == -1:
+                        errors.append(RowError(reader.line_num,
+                            f"unknown activity_type {row['activity_type']!r}", row))
+                        continue
+                except KeyError as error:
+                    errors.append(RowError(reader.line_num,
+                                           f"missing column {error}", row))
+                    continue
+                except (AttributeError, TypeError):
+                    # A field the row needs is None because the row is short
+                    errors.append(RowError(reader.line_num,
+                                           missing_fields_problem(row), row))
+                    continue
+                except ValueError as error:
+                    # A field is empty or cannot be converted
+                    errors.append(RowError(reader.line_num, str(error), row))
+                    continue
+
+            yield activity
+
+def split_activities(activities) -> tuple:
+    '''
+    Splits activities into a tuple of lists of SportsTournament, TalentShow
+    and AcademicCompetition
+    '''
+    sports_tournaments = []
+    talent_shows = []
+    academic_competitions = []
+
+    for activity in activities:
+        if isinstance(activity, SportsTournament):
+            sports_tournaments.append(activity)
+        elif isinstance(activity, TalentShow):
+            talent_shows.append(activity)
+        else:
+            academic_competitions.append(activity)
 
-            if activity_type == "Sports":
-                # It is a SportsTournament
-                game_type = activity["game_type"]
-                duration_minutes = int(activity["duration_minutes"])
+    return (sports_tournaments, talent_shows, academic_competitions)
+
+def load_activities_data(filepath: str):
+    '''
+    Loads the activities data and returns a tuple of lists of SportsTournament,
+    TalentShow and AcademicCompetition.
+    '''
+    activities = []
+    for activity in iter_activities(filepath):
+        if activity == -1:
+            # Invalid input
+            return -1
+        activities.append(activity)
+
+    return split_activities(activities)
+
+def import_activities_data(filepath: str):
+    '''
+    Bulk import version of load_activities_data. Instead of stopping at the
+    first invalid row, invalid rows are skipped and reported. Returns a tuple
+    of the lists of SportsTournament, TalentShow and AcademicCompetition and
+    the list of RowErrors.
+    '''
+    errors = []
+    sports_tournaments, talent_shows, academic_competitions = \
+        split_activities(iter_activities(filepath, errors=errors))
 
-                sports_tournament = SportsTournament(activity_id, activity_name,
-                    activity_type, max_participants, grade_level, is_active,
-                    participants, organizers, game_type, duration_minutes)
+    return (sports_tournaments, talent_shows, academic_competitions, errors)
 
-                sports_tournaments.append(sports_tournament)
+# Columns of the participant and activity csv files
+PARTICIPANT_COLUMNS = ("idi", "name", "birth_year", "birth_month", "birth_day",
+                       "gender", "grade_level", "class_assigned", "gpa",
+                       "selected_activity", "talent_score", "athletic_score",
+                       "leadership_score", "subject", "mentor_grade",
+                       "mentor_class", "judge")
 
-            elif activity_type == "Talent":
-                # It is a TalentShow
-                talent_categories = activity["talent_categories"].split("-")
+ACTIVITY_COLUMNS = ("activity_id", "activity_name", "activity_type",
+                    "max_participants", "grade_level", "game_type",
+                    "duration_minutes", "talent_categories", "subjects",
+                    "max_marks")
 
-                talent_show = TalentShow(activity_id, activity_name,
-                    activity_type, max_participants, grade_level, is_active,
-                    participants, organizers, talent_categories)
+# Size of the buffer used by the fast loaders
+READ_BUFFER_SIZE = 1 << 20
 
-                talent_shows.append(talent_show)
+# Number of rows that load_participant_data_fast validates at once
+READ_BATCH_ROWS = 1 << 16
 
-            elif activity_type == "Academic":
-                # It is a AcademicCompetition
-                subjects = activity["subjects"].split("-")
-                max_marks = float(activity["max_marks"])
+def column_indices(header: list[str], columns: tuple) -> tuple:
+    '''
+    Returns the position of every column of columns in the header row, or -1
+    if one of them is missing.
+    '''
+    positions = {column: index for index, column in enumerate(header)}
+    if any(column not in positions for column in columns):
+        # Invalid input
+        return -1
+
+    return tuple(positions[column] for column in columns)
+
+def load_participant_data_fast(filepath: str,
+                               reference_date: tuple = AGE_REFERENCE_DATE,
+                               invalid_rows: list = None,
+                               promote: bool = False):
+    '''
+    Faster version of load_participant_data for large files. Returns the same
+    tuple of lists of Students and Teachers, or -1 for invalid input.
+
+    The positions of the columns are looked up once from the header. Every
+    row is then read with csv.reader as a plain list, and the objects are
+    built from positional fields. This avoids the dictionary that
+    csv.DictReader builds for each row and the keyed lookups into it. The
+    garbage collector is paused during the load: the new objects cannot form
+    cycles yet, so its passes over them would only cost time.
+
+    Like in participant_from_row, only the birth dates of students have to
+    be valid. If invalid_rows is a list, rows are read in batches of
+    READ_BATCH_ROWS and the birth dates of a whole batch are checked at once
+    with validate_dates. The rows with an invalid birth date are skipped and
+    their index (0 for the first row after the header, empty lines not
+    counted) is appended to it. Otherwise the first invalid birth date makes
+    the load return -1, so each row is checked on its own while it is read.
+    promote works like in load_participant_data.
+    '''
+    with open(filepath, 'r', newline='', buffering=READ_BUFFER_SIZE) as f:
+        reader = csv.reader(f)
+
+        header = next(reader, [])
+        indices = column_indices(header, PARTICIPANT_COLUMNS)
+        if indices == -1:
+            # Invalid input
+            return -1
+
+        # Positions of the optional columns, None if they are missing
+        specialization_indices = [header.index(column) if column in header
+                                  else None for column in SPECIALIZATION_COLUMNS]
 
-                academic_competition = AcademicCompetition(activity_id,
-                    activity_name, activity_type, max_participants, grade_level,
-                    is_active, participants, organizers, subjects, max_marks)
+        (idi_i, name_i, birth_year_i, birth_month_i, birth_day_i, gender_i,
+         grade_level_i, class_assigned_i, gpa_i, selected_activity_i,
+         talent_score_i, athletic_score_i, leadership_score_i, subject_i,
+         mentor_grade_i, mentor_class_i, judge_i) = indices
 
-                academic_competitions.append(academic_competition)
+        students = []
+        teachers = []
 
+        def add(row: list, birth_year: int, birth_month: int,
+                birth_day: int) -> None:
+            '''Builds the participant of row. Returns -1 if row is invalid.'''
+            if len(row) > gpa_i and row[gpa_i]:
+                # participant is a Student
+                attributes = (
+                    row[name_i], int(row[idi_i]), birth_year, birth_month,
+                    birth_day, row[gender_i], int(row[grade_level_i]),
+                    row[class_assigned_i], float(row[gpa_i]),
+                    row[selected_activity_i], float(row[talent_score_i]),
+                    float(row[athletic_score_i]), float(row[leadership_score_i]))
+
+                if promote:
+                    # Built as its specialised class
+                    students.append(promoted_student(attributes,
+                        *[row[i] if i is not None and i < len(row) else None
+                          for i in specialization_indices],
+                        reference_date=reference_date))
+                else:
+                    students.append(Student(*attributes,
+                                            reference_date=reference_date))
+                return
+
+            # participant is a Teacher
+            judge = row[judge_i].strip().upper()
+            if judge == "TRUE":
+                judge = True
+            elif judge == "FALSE":
+                judge = False
             else:
                 # Invalid input
                 return -1
-            
-    return (sports_tournaments, talent_shows, academic_competitions)
-                                                     
-            
-        
-                    
-                    
-                
-                
-                
-                
-                
+
+            teachers.append(Teacher(
+                row[name_i], int(row[idi_i]), birth_year, birth_month,
+                birth_day, row[gender_i], row[subject_i],
+                int(row[mentor_grade_i]), row[mentor_class_i], judge))
+
+        # csv.DictReader skips empty lines too
+        rows = filter(None, reader)
+
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            if invalid_rows is None:
+                for row in rows:
+                    birth_year = int(row[birth_year_i])
+                    birth_month = int(row[birth_month_i])
+                    birth_day = int(row[birth_day_i])
+
+                    # Teachers keep their birth date as it is, only students
+                    # compute an age from it
+                    if (len(row) > gpa_i and row[gpa_i]
+                            and not check_valid_date(birth_year, birth_month,
+                                                     birth_day)):
+                        # Invalid input
+                        return -1
+
+                    if add(row, birth_year, birth_month, birth_day) == -1:
+                        # Invalid input
+                        return -1
+
+                return (students, teachers)
+
+            # Index of the first row of the current batch
+            first_row = 0
+            while True:
+                batch = list(islice(rows, READ_BATCH_ROWS))
+                if not batch:
+                    break
+
+                birth_years = [int(row[birth_year_i]) for row in batch]
+                birth_months = [int(row[birth_month_i]) for row in batch]
+                birth_days = [int(row[birth_day_i]) for row in batch]
+
+                invalid = {first_row + position for position in
+                           validate_dates(birth_years, birth_months, birth_days)
+                           if len(batch[position]) > gpa_i and batch[position][gpa_i]}
+                invalid_rows.extend(sorted(invalid))
+
+                for position, row in enumerate(batch):
+                    if invalid and first_row + position in invalid:
+                        continue
+
+                    if add(row, birth_years[position], birth_months[position],
+                           birth_days[position]) == -1:
+                        # Invalid input
+                        return -1
+
+                first_row += len(batch)
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+    return (students, teachers)
+
+def load_activities_data_fast(filepath: str):
+    '''
+    Faster version of load_activities_data for large files, see
+    load_participant_data_fast. Returns the same tuple of lists of
+    SportsTournament, TalentShow and AcademicCompetition, or -1 for invalid
+    input.
+    '''
+    with open(filepath, 'r', newline='', buffering=READ_BUFFER_SIZE) as f:
+        reader = csv.reader(f)
+
+        indices = column_indices(next(reader, []), ACTIVITY_COLUMNS)
+        if indices == -1:
+            # Invalid input
+            return -1
+
+        (activity_id_i, activity_name_i, activity_type_i, max_participants_i,
+         grade_level_i, game_type_i, duration_minutes_i, talent_categories_i,
+         subjects_i, max_marks_i) = indices
+
+        sports_tournaments = []
+        talent_shows = []
+        academic_competitions = []
+
+        for row in reader:
+            if not row:
+                # csv.DictReader skips empty lines too
+                continue
+
+            activity_id = int(row[activity_id_i])
+            activity_name = row[activity_name_i]
+            activity_type = row[activity_type_i]
+            max_participants = int(row[max_participants_i])
+            grade_level = int(row[grade_level_i])
+
+            if activity_type == "Sports":
+                sports_tournaments.append(SportsTournament(activity_id,
+                    activity_name, activity_type, max_participants,
+                    grade_level, False, [], [], row[game_type_i],
+                    int(row[duration_minutes_i])))
+
+            elif activity_type == "Talent":
+                talent_shows.append(TalentShow(activity_id, activity_name,
+                    activity_type, max_participants, grade_level, False, [],
+                    [], row[talent_categories_i].split("-")))
+
+            elif activity_type == "Academic":
+                academic_competitions.append(AcademicCompetition(activity_id,
+                    activity_name, activity_type, max_participants,
+                    grade_level, False, [], [], row[subjects_i].split("-"),
+                    float(row[max_marks_i])))
+
+            else:
+                # Invalid input
+                return -1
+
+    return (sports_tournaments, talent_shows, academic_competitions)
+
+def write_synthetic_participants(filepath: str, n_rows: int) -> None:
+    '''
+    Writes a participant csv file with n_rows made up rows (9 students for
+    every teacher), used to benchmark the loaders.
+    '''
+    activities = ("Sports", "Talent", "Academic")
+    with open(filepath, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(PARTICIPANT_COLUMNS)
+        writer.writerows(
+            (i, f"Student {i}", 2000 + i % 15, 1 + i % 12, 1 + i % 28,
+             "Male" if i % 2 else "Female", 1 + i % 12, "ABCD"[i % 4],
+             (i % 101) / 10, activities[i % 3], float(i % 97),
+             float(i % 89), float(i % 83), "", "", "", "")
+            if i % 10 else
+            (i, f"Teacher {i}", 1970 + i % 20, 1 + i % 12, 1 + i % 28,
+             "Female", "", "", "", "", "", "", "", "Maths", 1 + i % 12,
+             "ABCD"[i % 4], "TRUE" if i % 20 else "FALSE")
+            for i in range(n_rows))
+
+def benchmark_participant_loading(n_rows: int = 1_000_000) -> tuple:
+    '''
+    Times load_participant_data against load_participant_data_fast on a
+    synthetic file with n_rows rows. Prints and returns both times in seconds.
+    The ages memoized by age_on are cleared before each load, so that the
+    second one does not reuse the ages computed by the first.
+    '''
+    with tempfile.TemporaryDirectory() as directory:
+        filepath = os.path.join(directory, "participants.csv")
+        write_synthetic_participants(filepath, n_rows)
+
+        age_on.cache_clear()
+        start = time.perf_counter()
+        students, teachers = load_participant_data(filepath)
+        slow_seconds = time.perf_counter() - start
+
+        # Freed before the second load, so that it starts from the same memory
+        del students, teachers
+
+        age_on.cache_clear()
+        start = time.perf_counter()
+        load_participant_data_fast(filepath)
+        fast_seconds = time.perf_counter() - start
+
+    print(f"Rows:\t\t\t{n_rows}")
+    print(f"load_participant_data:\t{slow_seconds:.2f} s")
+    print(f"load_participant_data_fast:\t{fast_seconds:.2f} s")
+    print(f"Speedup:\t\t{slow_seconds/fast_seconds:.2f}x")
+    return (slow_seconds, fast_seconds)
+
+def load_shards(loader, paths: list[str], workers: int = None) -> list:
+    '''
+    Runs loader on every path and returns the results in the same order as
+    paths. With more than one worker the files are parsed in a pool of
+    processes, otherwise they are parsed one after the other.
+    '''
+    if workers == 1 or len(paths) <= 1:
+        return [loader(path) for path in paths]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # map returns the results in the order of paths, whatever order the
+        # workers finish in
+        return list(pool.map(loader, paths))
+
+def load_participants_parallel(paths: list[str], workers: int = None,
+                               reference_date: tuple = AGE_REFERENCE_DATE,
+                               promote: bool = False):
+    '''
+    Loads several participant csv files (shards) in parallel and returns a
+    tuple of lists of Students and Teachers, in the same order as loading the
+    files one after the other with load_participant_data. Returns -1 if any
+    shard is invalid.
+    '''
+    students = []
+    teachers = []
+
+    loader = functools.partial(load_participant_data,
+                               reference_date=reference_date, promote=promote)
+    for shard in load_shards(loader, paths, workers):
+        if shard == -1:
+            # Invalid input
+            return -1
+
+        students.extend(shard[0])
+        teachers.extend(shard[1])
+
+    return (students, teachers)
+
+def load_activities_parallel(paths: list[str], workers: int = None):
+    '''
+    Loads several activity csv files (shards) in parallel and returns a tuple
+    of lists of SportsTournament, TalentShow and AcademicCompetition, in the
+    same order as loading the files one after the other with
+    load_activities_data. Returns -1 if any shard is invalid.
+    '''
+    sports_tournaments = []
+    talent_shows = []
+    academic_competitions = []
+
+    for shard in load_shards(load_activities_data, paths, workers):
+        if shard == -1:
+            # Invalid input
+            return -1
+
+        sports_tournaments.extend(shard[0])
+        talent_shows.extend(shard[1])
+        academic_competitions.extend(shard[2])
+
+    return (sports_tournaments, talent_shows, academic_competitions)
+###############################################################################
+
+from array import array
+from itertools import compress
+
+# Codes used in ParticipantTable.kind to remember the class of each row
+KIND_STUDENT = 0
+KIND_ARTIST = 1
+KIND_ATHLETE = 2
+KIND_SCHOLAR = 3
+
+def specialized_values(student: Student) -> tuple:
+    '''
+    Returns (kind, specialization, fitness_score, olympiad_scores,
+    performance_level) for student. specialization is the talent of an
+    Artist, the sports_category of an Athlete or the subject_specialization of
+    a Scholar. Attributes that the class of student does not have are None,
+    0.0 or an empty list.
+    '''
+    values = student.get_values()
+
+    if isinstance(student, Artist):
+        performance_level, talent = values[15:]
+        return (KIND_ARTIST, talent, 0.0, [], performance_level)
+
+    if isinstance(student, Athlete):
+        sports_category, fitness_score, performance_level = values[15:]
+        return (KIND_ATHLETE, sports_category, fitness_score, [],
+                performance_level)
+
+    if isinstance(student, Scholar):
+        subject_specialization, olympiad_scores, performance_level = values[15:]
+        return (KIND_SCHOLAR, subject_specialization, 0.0, olympiad_scores,
+                performance_level)
+
+    return (KIND_STUDENT, None, 0.0, [], 0.0)
+
+def build_student(kind: int, attributes: tuple, specialization: str,
+                  fitness_score: float, olympiad_scores: list[float],
+                  performance_level: float,
+                  reference_date: tuple = AGE_REFERENCE_DATE) -> Student:
+    '''
+    Builds a Student, Artist, Athlete or Scholar depending on kind, whose age
+    is computed on reference_date (day, month, year). attributes holds the
+    arguments of the Student constructor. This is the opposite of
+    specialized_values.
+    '''
+    if kind == KIND_ARTIST:
+        student = Artist(*attributes, specialization,
+                         reference_date=reference_date)
+    elif kind == KIND_ATHLETE:
+        student = Athlete(*attributes, specialization, fitness_score,
+                          reference_date=reference_date)
+    elif kind == KIND_SCHOLAR:
+        student = Scholar(*attributes, specialization, olympiad_scores,
+                          reference_date=reference_date)
+        if specialized_values(student)[4] != performance_level:
+            # performance_level was set on its own through set_values. Artists
+            # and Athletes always mirror it from their score.
+            student.set_values({"performance_level": performance_level})
+    else:
+        return Student(*attributes, reference_date=reference_date)
+
+    return student
+
+class ParticipantTable:
+    def __init__(self, reference_date: tuple = None):
+        '''
+        Constructs an empty ParticipantTable.
+
+        Instead of one Student object per student, the table keeps one typed
+        array per attribute (column). Row i of every column belongs to the
+        same student. Strings that repeat a lot (class_assigned) are stored
+        once in class_names and referred to by their index in class_code.
+
+        The age column holds the ages on reference_date (day, month, year),
+        which the rebuilt objects use too. If it is None, the reference date
+        of the first student appended is used.
+        '''
+        self.reference_date = reference_date
+
+        # Numeric columns used for eligibility and scoring
+        self.idi = array('q')
+        self.birth_year = array('h')
+        self.birth_month = array('b')
+        self.birth_day = array('b')
+        self.age = array('h')
+        self.grade_level = array('b')
+        self.class_code = array('i')
+        self.gpa = array('d')
+        self.talent_score = array('d')
+        self.athletic_score = array('d')
+        self.leadership_score = array('d')
+        self.kind = array('b')
+
+        # Columns of the specialised students. Rows of other kinds hold 0.0
+        self.performance_level = array('d')
+        self.fitness_score = array('d')
+        self.olympiad_total = array('d')
+        self.best_olympiad = array('d')
+
+        # Every olympiad score of every row, one after the other. The scores
+        # of row i are olympiad_scores[olympiad_offsets[i]:olympiad_offsets[i+1]]
+        self.olympiad_scores = array('d')
+        self.olympiad_offsets = array('q', [0])
+
+        # Columns that are only needed to rebuild the objects
+        self.names = []
+        self.genders = []
+        self.selected_activities = []
+        # talent for Artist, sports_category for Athlete and
+        # subject_specialization for Scholar
+        self.specializations = []
+
+        self.class_names = []
+        self.__class_codes = {}
+
+        # Objects that have already been rebuilt, by row
+        self.__objects = {}
+
+    @classmethod
+    def from_participants(cls, participants, reference_date: tuple = None):
+        '''
+        Builds a table from an iterable of students. Works with generators
+        such as iter_participants, so the objects do not all have to be in
+        memory at the same time. Returns -1 if any participant is not a Student.
+        reference_date works like in the constructor.
+        '''
+        table = cls(reference_date)
+        for participant in participants:
+            if table.append(participant) == -1:
+                # Invalid input
+                return -1
+
+        return table
+
+    def __len__(self) -> int:
+        return len(self.idi)
+
+    def __getitem__(self, row: int) -> Student:
+        return self.participant(row)
+
+    def append(self, student: Student) -> None:
+        '''
+        Adds a row holding the attributes of student. If student's age was
+        computed on another reference date than the table's, the row gets its
+        age on the table's reference date.
+        '''
+        if not isinstance(student, Student):
+            # Invalid input
+            return -1
+
+        (name, idi, birth_year, birth_month, birth_day, gender, age,
+         grade_level, class_assigned, gpa, selected_activity, talent_score,
+         athletic_score, leadership_score) = student.get_values()[:14]
+
+        reference_date = student._Student__reference_date
+        if self.reference_date is None:
+            self.reference_date = reference_date
+        elif reference_date != self.reference_date:
+            age = age_on((birth_year, birth_month, birth_day),
+                         self.reference_date)
+
+        code = self.__class_codes.get(class_assigned)
+        if code is None:
+            # First time this class is seen
+            code = len(self.class_names)
+            self.__class_codes[class_assigned] = code
+            self.class_names.append(class_assigned)
+
+        self.idi.append(idi)
+        self.birth_year.append(birth_year)
+        self.birth_month.append(birth_month)
+        self.birth_day.append(birth_day)
+        self.age.append(age)
+        self.grade_level.append(grade_level)
+        self.class_code.append(code)
+        self.gpa.append(gpa)
+        self.talent_score.append(talent_score)
+        self.athletic_score.append(athletic_score)
+        self.leadership_score.append(leadership_score)
+        self.names.append(name)
+        self.genders.append(gender)
+        self.selected_activities.append(selected_activity)
+
+        (kind, specialization, fitness_score, olympiad_scores,
+         performance_level) = specialized_values(student)
+
+        self.kind.append(kind)
+        self.performance_level.append(performance_level)
+        self.fitness_score.append(fitness_score)
+        self.specializations.append(specialization)
+        self.olympiad_scores.extend(olympiad_scores)
+        self.olympiad_offsets.append(len(self.olympiad_scores))
+        self.olympiad_total.append(sum(olympiad_scores))
+        # An empty list of olympiad scores can never make a Scholar eligible
+        self.best_olympiad.append(max(olympiad_scores, default=-math.inf))
+
+    def recompute_ages(self, reference_date: tuple = AGE_REFERENCE_DATE) -> None:
+        '''
+        Recomputes the age column for another reference date (day, month,
+        year), working on the birth date columns all at once. The rebuilt
+        objects use the new reference date too.
+        '''
+        self.age = array('h', compute_ages(self.birth_year, self.birth_month,
+                                           self.birth_day, reference_date))
+        self.reference_date = reference_date
+        # Rebuilt objects would have the old ages
+        self.__objects.clear()
+
+    def is_eligible(self) -> array:
+        '''
+        Returns an array with 1 for every eligible row and 0 otherwise.
+        Uses the same rules as the is_eligible method of each row's class.
+        '''
+        return array('b', [
+            (gpa > 6.0 and age >= 16) if kind == KIND_ARTIST
+            else (gpa > 5.5 and age >= 12) if kind == KIND_ATHLETE
+            else (gpa > 8.0 and age >= 10 and best > 80) if kind == KIND_SCHOLAR
+            else gpa >= 5.0
+            for kind, gpa, age, best in zip(self.kind, self.gpa, self.age,
+                                            self.best_olympiad)])
+
+    def compute_scores(self) -> array:
+        '''
+        Returns an array with the score of every row, using the same formula
+        as the compute_scores method of each row's class. Rows that are not
+        eligible, and plain Students (which cannot be scored), get -1.
+        '''
+        scores = array('d', [
+            performance_level if kind == KIND_ARTIST
+            else fitness_score * performance_level if kind == KIND_ATHLETE
+            else total * performance_level if kind == KIND_SCHOLAR
+            else -1
+            for kind, performance_level, fitness_score, total in zip(
+                self.kind, self.performance_level, self.fitness_score,
+                self.olympiad_total)])
+
+        for row, eligible in enumerate(self.is_eligible()):
+            if not eligible:
+                # Fail condition
+                scores[row] = -1
+
+        return scores
+
+    def participant(self, row: int) -> Student:
+        '''
+        Returns the object stored in row. The object is only built the first
+        time it is asked for, later calls return the same object.
+        '''
+        student = self.__objects.get(row)
+        if student is not None:
+            return student
+
+        attributes = (self.names[row], self.idi[row], self.birth_year[row],
+                      self.birth_month[row], self.birth_day[row],
+                      self.genders[row], self.grade_level[row],
+                      self.class_names[self.class_code[row]], self.gpa[row],
+                      self.selected_activities[row], self.talent_score[row],
+                      self.athletic_score[row], self.leadership_score[row])
+        start = self.olympiad_offsets[row]
+        end = self.olympiad_offsets[row + 1]
+
+        student = build_student(self.kind[row], attributes,
+                                self.specializations[row],
+                                self.fitness_score[row],
+                                self.olympiad_scores[start:end].tolist(),
+                                self.performance_level[row],
+                                self.reference_date or AGE_REFERENCE_DATE)
+
+        self.__objects[row] = student
+        return student
+
+    def to_participants(self):
+        '''Yields the object of every row, building them one at a time'''
+        for row in range(len(self)):
+            yield self.participant(row)
+
+    def determine_winner(self) -> int:
+        '''
+        Returns the row of the eligible student with the highest score, or -1
+        if no student is eligible. Ties go to the lowest idi.
+        '''
+        return select_winner(self.compute_scores(), self.idi, self.is_eligible())
+
+    def determine_team_winner(self) -> int:
+        '''
+        Returns the row of the best student of the class with the highest
+        average score, like a Team SportsTournament. Returns -1 if no student
+        is eligible.
+        '''
+        return select_team_winner(self.compute_scores(), self.idi,
+                                  self.class_code, self.is_eligible())
+
+
+def select_winner(scores, ids, eligible=None) -> int:
+    '''
+    Batch winner engine shared by all the activities.
+
+    scores and ids are sequences (lists or arrays) where row i holds the score
+    and the idi of the i-th participant. If eligible is given, only the rows
+    where it is true can win. Returns the row with the highest score, using
+    the lowest idi to break ties, exactly like
+    max(..., key = lambda p: [p.compute_scores(), -p.idi]).
+    Returns -1 if there is no row that can win.
+
+    Instead of building a [score, -idi] list for every row, the best score is
+    found with one max over the scores and only the rows that share it are
+    compared by idi.
+    '''
+    if eligible is None:
+        rows = range(len(scores))
+        if len(rows) == 0:
+            # Fail condition
+            return -1
+        best_score = max(scores)
+    else:
+        rows = list(compress(range(len(scores)), eligible))
+        if len(rows) == 0:
+            # Fail condition
+            return -1
+        best_score = max(map(scores.__getitem__, rows))
+
+    # Among the rows with the best score, the lowest idi wins
+    best_rows = [row for row in rows if scores[row] == best_score]
+    return min(best_rows, key = ids.__getitem__)
+
+def winner_from_participants(participants: list[Student]) -> Student:
+    '''
+    Returns the eligible participant with the highest compute_scores(), using
+    the lowest idi to break ties. Returns -1 if no participant is eligible.
+    '''
+    eligible = [p.is_eligible() for p in participants]
+    scores = array('d', [p.compute_scores() if is_eligible else -1
+                         for p, is_eligible in zip(participants, eligible)])
+    ids = [p.idi for p in participants]
+
+    row = select_winner(scores, ids, eligible)
+    if row == -1:
+        # Fail condition
+        return -1
+
+    return participants[row]
+
+def team_winner_from_participants(participants: list[Athlete]) -> Athlete:
+    '''
+    Returns the winner of a Team SportsTournament.
+
+    Eligible athletes are grouped into teams by class_assigned. The team with
+    the highest average score wins (the team seen first wins a tie) and its
+    member with the highest score, then lowest idi, is returned. Returns -1 if
+    no athlete is eligible.
+
+    Each team only keeps a running sum, a count and its best member, so
+    the participants are read once and every score is computed once.
+    '''
+    # Maps class_assigned to [score sum, member count, best score, best member]
+    teams = {}
+    for athlete in participants:
+        if not athlete.is_eligible():
+            continue
+
+        score = athlete.compute_scores()
+        team = teams.get(athlete._Student__class_assigned)
+        if team is None:
+            teams[athlete._Student__class_assigned] = [score, 1, score, athlete]
+            continue
+
+        team[0] += score
+        team[1] += 1
+        if score > team[2] or (score == team[2] and athlete.idi < team[3].idi):
+            # New best member of the team
+            team[2] = score
+            team[3] = athlete
+
+    if len(teams) == 0:
+        # Fail Condition
+        return -1
+
+    best_team = None
+    best_team_avg = None
+    for team in teams.values():
+        team_avg = team[0]/team[1]
+
+        # Update the best team if this team has better average
+        if best_team_avg is None or team_avg > best_team_avg:
+            best_team = team
+            best_team_avg = team_avg
+
+    # Return the athlete with highest score in the winning team
+    return best_team[3]
+
+def select_team_winner(scores, ids, class_codes, eligible=None) -> int:
+    '''
+    Column version of team_winner_from_participants.
+
+    class_codes holds a small non-negative integer per row identifying the
+    team (see ParticipantTable.class_code). The sums, counts and best rows are
+    kept in lists indexed by class code, like a bincount, instead of a
+    dictionary. Returns the winning row, or -1 if no row is eligible.
+    '''
+    if len(scores) == 0:
+        # Fail Condition
+        return -1
+
+    if eligible is None:
+        rows = range(len(scores))
+    else:
+        rows = compress(range(len(scores)), eligible)
+
+    n_codes = max(class_codes) + 1
+    sums = [0.0] * n_codes
+    counts = [0] * n_codes
+    best_rows = [-1] * n_codes
+    # Codes in the order their team is first seen, used to break ties
+    team_order = []
+
+    for row in rows:
+        code = class_codes[row]
+        score = scores[row]
+        sums[code] += score
+        counts[code] += 1
+
+        best_row = best_rows[code]
+        if best_row == -1:
+            team_order.append(code)
+            best_rows[code] = row
+        elif score > scores[best_row] or (score == scores[best_row]
+                                          and ids[row] < ids[best_row]):
+            best_rows[code] = row
+
+    if len(team_order) == 0:
+        # Fail Condition
+        return -1
+
+    best_code = team_order[0]
+    best_team_avg = sums[best_code]/counts[best_code]
+    for code in team_order:
+        team_avg = sums[code]/counts[code]
+        if team_avg > best_team_avg:
+            best_code = code
+            best_team_avg = team_avg
+
+    return best_rows[best_code]
+###############################################################################
+
+import mmap
+import struct
+
+# A snapshot file starts with a header, followed by these sections:
+#   string offsets  (n_strings + 1) uint64, where string i is
+#                   string_data[offsets[i]:offsets[i+1]] decoded as utf-8
+#   string data     all the strings, one after the other
+#   index table     uint32 values: rows of participants and organizers of the
+#                   activities, and string numbers of lists of strings
+#   float table     float64 values: olympiad scores
+#   students        one STUDENT_RECORD per student
+#   teachers        one TEACHER_RECORD per teacher
+#   activities      one ACTIVITY_RECORD per activity
+# Every record has a fixed size, so record i can be read without reading the
+# ones before it. Strings are stored as their number in the string table.
+SNAPSHOT_MAGIC = b"THSNAP02"
+
+SNAPSHOT_HEADER = struct.Struct("<8s13Q")
+
+# kind, idi, birth_year, birth_month, birth_day, day, month and year of the
+# reference date of the age, name, gender, grade_level, class_assigned, gpa,
+# selected_activity, talent_score, athletic_score, leadership_score,
+# performance_level, specialization, fitness_score, olympiad offset,
+# olympiad count
+STUDENT_RECORD = struct.Struct("<BqhhhhhhIIhIdIddddIdII")
+
+# idi, birth_year, birth_month, birth_day, name, gender, subject,
+# mentor_grade, mentor_class, judge
+TEACHER_RECORD = struct.Struct("<qhhhIIIhI?")
+
+# kind, activity_id, activity_name, activity_type, max_participants,
+# grade_level, is_active, participants offset, participants count,
+# organizers offset, organizers count, game_type, duration_minutes,
+# talent_categories or subjects offset, their count, max_marks
+ACTIVITY_RECORD = struct.Struct("<BqIIqh?IIIIIqIId")
+
+# String number used when there is no string, e.g. the talent of a Student
+NO_STRING = 0xFFFFFFFF
+
+# Codes used in ACTIVITY_RECORD to remember the class of each activity
+KIND_ACTIVITY = 0
+KIND_SPORTS_TOURNAMENT = 1
+KIND_TALENT_SHOW = 2
+KIND_ACADEMIC_COMPETITION = 3
+
+def little_endian_bytes(table: array) -> bytes:
+    '''
+    Returns the bytes of table in little endian order. Arrays use the byte
+    order of the machine, so they are swapped first if needed.
+    '''
+    if sys.byteorder != "little":
+        table = array(table.typecode, table)
+        table.byteswap()
+    return table.tobytes()
+
+def save_snapshot(filepath: str, students: list[Student],
+                  teachers: list[Teacher], activities: list[Activity]) -> None:
+    '''
+    Saves students, teachers and activities to a binary snapshot file that
+    open_snapshot can reopen without parsing any csv file.
+
+    activities can mix SportsTournament, TalentShow and AcademicCompetition.
+    Their participants and organizers are saved as rows of the student and
+    teacher records. Participants or organizers that are not in students or
+    teachers are added at the end of them.
+    '''
+    students = list(students)
+    teachers = list(teachers)
+
+    strings = []
+    string_numbers = {}
+
+    def string_number(value: str) -> int:
+        '''Returns the number of value in the string table, adding it if needed'''
+        if value is None:
+            return NO_STRING
+        number = string_numbers.get(value)
+        if number is None:
+            number = len(strings)
+            string_numbers[value] = number
+            strings.append(value)
+        return number
+
+    index_table = array('I')
+    float_table = array('d')
+
+    student_rows = {id(s): row for row, s in enumerate(students)}
+    teacher_rows = {id(t): row for row, t in enumerate(teachers)}
+
+    def row_of(obj, rows: dict, objects: list) -> int:
+        '''Returns the row of obj, adding obj at the end of objects if needed'''
+        row = rows.get(id(obj))
+        if row is None:
+            row = len(objects)
+            rows[id(obj)] = row
+            objects.append(obj)
+        return row
+
+    # Activities are packed first because they can add students and teachers
+    activity_records = []
+    for activity in activities:
+        values = activity.get_values()
+        (activity_id, activity_name, activity_type, max_participants,
+         grade_level, is_active) = values[:6]
+
+        participants_offset = len(index_table)
+        index_table.extend(row_of(p, student_rows, students)
+                           for p in activity._Activity__participants)
+        organizers_offset = len(index_table)
+        index_table.extend(row_of(o, teacher_rows, teachers)
+                           for o in activity._Activity__organizers)
+
+        game_type = None
+        duration_minutes = 0
+        string_list = []
+        max_marks = 0.0
+
+        if isinstance(activity, SportsTournament):
+            kind = KIND_SPORTS_TOURNAMENT
+            game_type, duration_minutes = values[8:]
+        elif isinstance(activity, TalentShow):
+            kind = KIND_TALENT_SHOW
+            string_list = values[8]
+        elif isinstance(activity, AcademicCompetition):
+            kind = KIND_ACADEMIC_COMPETITION
+            string_list, max_marks = values[8:]
+        else:
+            kind = KIND_ACTIVITY
+
+        strings_offset = len(index_table)
+        index_table.extend(string_number(value) for value in string_list)
+
+        activity_records.append(ACTIVITY_RECORD.pack(
+            kind, activity_id, string_number(activity_name),
+            string_number(activity_type), max_participants, grade_level,
+            is_active, participants_offset,
+            organizers_offset - participants_offset, organizers_offset,
+            strings_offset - organizers_offset, string_number(game_type),
+            duration_minutes, strings_offset, len(string_list), max_marks))
+
+    student_records = []
+    for student in students:
+        (name, idi, birth_year, birth_month, birth_day, gender, age,
+         grade_level, class_assigned, gpa, selected_activity, talent_score,
+         athletic_score, leadership_score) = student.get_values()[:14]
+        (kind, specialization, fitness_score, olympiad_scores,
+         performance_level) = specialized_values(student)
+
+        student_records.append(STUDENT_RECORD.pack(
+            kind, idi, birth_year, birth_month, birth_day,
+            *student._Student__reference_date, string_number(name),
+            string_number(gender), grade_level, string_number(class_assigned),
+            gpa, string_number(selected_activity), talent_score,
+            athletic_score, leadership_score, performance_level,
+            string_number(specialization), fitness_score, len(float_table),
+            len(olympiad_scores)))
+        float_table.extend(olympiad_scores)
+
+    teacher_records = []
+    for teacher in teachers:
+        (name, idi, birth_year, birth_month, birth_day, gender, subject,
+         mentor_grade, mentor_class, judge) = teacher.get_values()
+
+        teacher_records.append(TEACHER_RECORD.pack(
+            idi, birth_year, birth_month, birth_day, string_number(name),
+            string_number(gender), string_number(subject), mentor_grade,
+            string_number(mentor_class), judge))
+
+    encoded_strings = [value.encode("utf-8") for value in strings]
+    string_offsets = array('Q', [0])
+    for encoded in encoded_strings:
+        string_offsets.append(string_offsets[-1] + len(encoded))
+
+    # Work out where every section starts
+    string_offsets_start = SNAPSHOT_HEADER.size
+    string_data_start = string_offsets_start + 8 * len(string_offsets)
+    index_start = string_data_start + string_offsets[-1]
+    floats_start = index_start + 4 * len(index_table)
+    students_start = floats_start + 8 * len(float_table)
+    teachers_start = students_start + STUDENT_RECORD.size * len(students)
+    activities_start = teachers_start + TEACHER_RECORD.size * len(teachers)
+
+    with open(filepath, 'wb') as f:
+        f.write(SNAPSHOT_HEADER.pack(
+            SNAPSHOT_MAGIC, len(students), len(teachers), len(activity_records),
+            len(strings), string_offsets_start, string_data_start,
+            index_start, len(index_table), floats_start, len(float_table),
+            students_start, teachers_start, activities_start))
+
+        f.write(little_endian_bytes(string_offsets))
+        f.writelines(encoded_strings)
+        f.write(little_endian_bytes(index_table))
+        f.write(little_endian_bytes(float_table))
+        f.writelines(student_records)
+        f.writelines(teacher_records)
+        f.writelines(activity_records)
+
+class SnapshotRecords:
+    def __init__(self, build, count: int):
+        '''
+        Constructs a read-only list of the records of one section of a
+        snapshot. A record is only turned into an object by build the first
+        time it is accessed. Later accesses return the same object.
+        '''
+        self.__build = build
+        self.__count = count
+        self.__objects = {}
+
+    def __len__(self) -> int:
+        return self.__count
+
+    def __getitem__(self, row: int):
+        if row < 0:
+            row += self.__count
+        if not 0 <= row < self.__count:
+            raise IndexError("snapshot record out of range")
+
+        obj = self.__objects.get(row)
+        if obj is None:
+            obj = self.__build(row)
+            self.__objects[row] = obj
+        return obj
+
+    def __iter__(self):
+        for row in range(self.__count):
+            yield self[row]
+
+class Snapshot:
+    def __init__(self, filepath: str):
+        '''
+        Opens a snapshot file written by save_snapshot.
+
+        The file is memory-mapped, so opening it does not read the records.
+        students, teachers and activities are SnapshotRecords which build the
+        objects one at a time when they are accessed.
+        '''
+        self.__file = open(filepath, 'rb')
+        self.__data = mmap.mmap(self.__file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (magic, n_students, n_teachers, n_activities, n_strings,
+         self.__string_offsets_start, self.__string_data_start,
+         self.__index_start, _, self.__floats_start, _,
+         self.__students_start, self.__teachers_start,
+         self.__activities_start) = SNAPSHOT_HEADER.unpack_from(self.__data)
+
+        if magic != SNAPSHOT_MAGIC:
+            self.close()
+            raise ValueError(f"{filepath} is not a snapshot file")
+
+        self.__strings = {}
+        self.students = SnapshotRecords(self.__build_student, n_students)
+        self.teachers = SnapshotRecords(self.__build_teacher, n_teachers)
+        self.activities = SnapshotRecords(self.__build_activity, n_activities)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        '''Closes the file. Objects that have already been built stay valid.'''
+        self.__data.close()
+        self.__file.close()
+
+    def __string(self, number: int) -> str:
+        '''Returns string number from the string table'''
+        if number == NO_STRING:
+            return None
+
+        value = self.__strings.get(number)
+        if value is None:
+            start, end = struct.unpack_from(
+                "<2Q", self.__data, self.__string_offsets_start + 8 * number)
+            value = str(self.__data[self.__string_data_start + start:
+                                    self.__string_data_start + end], "utf-8")
+            self.__strings[number] = value
+        return value
+
+    def __indices(self, offset: int, count: int) -> tuple:
+        '''Returns count values of the index table, starting at offset'''
+        return struct.unpack_from(f"<{count}I", self.__data,
+                                  self.__index_start + 4 * offset)
+
+    def __build_student(self, row: int) -> Student:
+        (kind, idi, birth_year, birth_month, birth_day, reference_day,
+         reference_month, reference_year, name, gender, grade_level,
+         class_assigned, gpa, selected_activity, talent_score, athletic_score,
+         leadership_score, performance_level, specialization, fitness_score,
+         olympiad_offset, olympiad_count) = \
+            STUDENT_RECORD.unpack_from(
+                self.__data, self.__students_start + STUDENT_RECORD.size * row)
+
+        olympiad_scores = list(struct.unpack_from(
+            f"<{olympiad_count}d", self.__data,
+            self.__floats_start + 8 * olympiad_offset))
+
+        attributes = (self.__string(name), idi, birth_year, birth_month,
+                      birth_day, self.__string(gender), grade_level,
+                      self.__string(class_assigned), gpa,
+                      self.__string(selected_activity), talent_score,
+                      athletic_score, leadership_score)
+
+        return build_student(kind, attributes, self.__string(specialization),
+                             fitness_score, olympiad_scores, performance_level,
+                             (reference_day, reference_month, reference_year))
+
+    def __build_teacher(self, row: int) -> Teacher:
+        (idi, birth_year, birth_month, birth_day, name, gender, subject,
+         mentor_grade, mentor_class, judge) = TEACHER_RECORD.unpack_from(
+            self.__data, self.__teachers_start + TEACHER_RECORD.size * row)
+
+        return Teacher(self.__string(name), idi, birth_year, birth_month,
+                       birth_day, self.__string(gender), self.__string(subject),
+                       mentor_grade, self.__string(mentor_class), judge)
+
+    def __build_activity(self, row: int) -> Activity:
+        (kind, activity_id, activity_name, activity_type, max_participants,
+         grade_level, is_active, participants_offset, participants_count,
+         organizers_offset, organizers_count, game_type, duration_minutes,
+         strings_offset, strings_count, max_marks) = \
+            ACTIVITY_RECORD.unpack_from(
+                self.__data, self.__activities_start + ACTIVITY_RECORD.size * row)
+
+        # Participants and organizers are shared with self.students and
+        # self.teachers, so they are only built once
+        participants = [self.students[i] for i in
+                        self.__indices(participants_offset, participants_count)]
+        organizers = [self.teachers[i] for i in
+                      self.__indices(organizers_offset, organizers_count)]
+        string_list = [self.__string(i) for i in
+                       self.__indices(strings_offset, strings_count)]
+
+        attributes = (activity_id, self.__string(activity_name),
+                      self.__string(activity_type), max_participants,
+                      grade_level, is_active, participants, organizers)
+
+        if kind == KIND_SPORTS_TOURNAMENT:
+            return SportsTournament(*attributes, self.__string(game_type),
+                                    duration_minutes)
+        if kind == KIND_TALENT_SHOW:
+            return TalentShow(*attributes, string_list)
+        if kind == KIND_ACADEMIC_COMPETITION:
+            return AcademicCompetition(*attributes, string_list, max_marks)
+        return Activity(*attributes)
+
+def open_snapshot(filepath: str) -> Snapshot:
+    '''Opens a snapshot file written by save_snapshot, see Snapshot'''
+    return Snapshot(filepath)
+###############################################################################
+
+from collections import deque
+
+class Registry:
+    def __init__(self, students: list[Student] = (),
+                 teachers: list[Teacher] = (), activities: list[Activity] = ()):
+        '''
+        Constructs a Registry, which owns the loaded participants and
+        activities and finds them without walking a list.
+
+        Every index is a dictionary from a key (an idi, a class, a grade...)
+        to a bucket, and every bucket is a dictionary from id(obj) to obj, so
+        adding, removing and finding are all O(1). The registry observes every
+        object it owns, and an object that changes through set_values is moved
+        to the buckets of its new keys.
+        '''
+        self.__students = {}
+        self.__teachers = {}
+        self.__activities = {}
+
+        # Indexes of the participants
+        self.__by_idi = {}
+        self.__by_class = {}
+        self.__by_grade = {}
+        self.__by_selected_activity = {}
+        self.__by_mentor_grade = {}
+        self.__by_mentor_class = {}
+
+        # Index of the activities
+        self.__by_activity_id = {}
+
+        # The (index, key) pairs each object is filed under, by id(obj), so
+        # that it can be taken out of its old buckets when it changes
+        self.__filed_under = {}
+
+        for student in students:
+            self.add_participant(student)
+        for teacher in teachers:
+            self.add_participant(teacher)
+        for activity in activities:
+            self.add_activity(activity)
+
+    def __index_keys(self, obj) -> tuple:
+        '''Returns the (index, key) pairs obj should be filed under'''
+        if isinstance(obj, Student):
+            return ((self.__by_idi, obj.idi),
+                    (self.__by_class, obj._Student__class_assigned),
+                    (self.__by_grade, obj._Student__grade_level),
+                    (self.__by_selected_activity, obj._Student__selected_activity))
+        if isinstance(obj, Teacher):
+            return ((self.__by_idi, obj.idi),
+                    (self.__by_mentor_grade, obj._Teacher__mentor_grade),
+                    (self.__by_mentor_class, obj._Teacher__mentor_class))
+        return ((self.__by_activity_id, obj.activity_id),)
+
+    def __file(self, obj) -> None:
+        '''Puts obj in the buckets of its current keys'''
+        filed_under = self.__index_keys(obj)
+        for index, key in filed_under:
+            index.setdefault(key, {})[id(obj)] = obj
+        self.__filed_under[id(obj)] = filed_under
+
+    def __unfile(self, obj) -> None:
+        '''Takes obj out of the buckets it was filed under'''
+        for index, key in self.__filed_under.pop(id(obj)):
+            bucket = index[key]
+            del bucket[id(obj)]
+            if not bucket:
+                # Do not keep empty buckets of keys that are no longer used
+                del index[key]
+
+    def _observed_changed(self, obj) -> None:
+        '''Called by an object whose attributes changed, refiles it'''
+        if id(obj) in self.__filed_under:
+            self.__unfile(obj)
+            self.__file(obj)
+
+    def add_participant(self, participant: Participant) -> None:
+        '''Adds a Student or Teacher to the registry'''
+        if not isinstance(participant, (Student, Teacher)):
+            # Invalid input
+            return -1
+        if id(participant) in self.__filed_under:
+            # Already registered
+            return
+
+        if isinstance(participant, Student):
+            self.__students[id(participant)] = participant
+        else:
+            self.__teachers[id(participant)] = participant
+
+        self.__file(participant)
+        participant._add_observer(self)
+
+    def remove_participant(self, participant: Participant) -> None:
+        '''Removes a Student or Teacher from the registry'''
+        if id(participant) not in self.__filed_under:
+            # Not registered
+            return -1
+
+        self.__students.pop(id(participant), None)
+        self.__teachers.pop(id(participant), None)
+        self.__unfile(participant)
+        participant._remove_observer(self)
+
+    def add_activity(self, activity: Activity) -> None:
+        '''Adds an activity to the registry'''
+        if not isinstance(activity, Activity):
+            # Invalid input
+            return -1
+        if id(activity) in self.__filed_under:
+            # Already registered
+            return
+
+        self.__activities[id(activity)] = activity
+        self.__file(activity)
+        activity._add_observer(self)
+
+    def remove_activity(self, activity: Activity) -> None:
+        '''Removes an activity from the registry'''
+        if id(activity) not in self.__filed_under:
+            # Not registered
+            return -1
+
+        del self.__activities[id(activity)]
+        self.__unfile(activity)
+        activity._remove_observer(self)
+
+    def participant(self, idi: int) -> Participant:
+        '''Returns the participant with this idi, or -1 if there is none'''
+        bucket = self.__by_idi.get(idi)
+        if not bucket:
+            # Fail condition
+            return -1
+
+        # If several participants share the idi, the first one registered wins
+        return next(iter(bucket.values()))
+
+    def activity(self, activity_id: int) -> Activity:
+        '''Returns the activity with this activity_id, or -1 if there is none'''
+        bucket = self.__by_activity_id.get(activity_id)
+        if not bucket:
+            # Fail condition
+            return -1
+
+        return next(iter(bucket.values()))
+
+    @staticmethod
+    def __match(everything: dict, buckets: list) -> list:
+        '''
+        Returns the objects that are in all the buckets, or everything if there
+        are no buckets. Only the smallest bucket is walked.
+        '''
+        if not buckets:
+            return list(everything.values())
+
+        buckets.sort(key = len)
+        smallest = buckets[0]
+        others = buckets[1:]
+        return [obj for key, obj in smallest.items()
+                if all(key in bucket for bucket in others)]
+
+    def students(self, class_assigned: str = None, grade_level: int = None,
+                 selected_activity: str = None) -> list[Student]:
+        '''
+        Returns the students that match every criterion given, e.g.
+        students(grade_level=10, class_assigned="B"). Students that changed
+        since they were registered can come after the others.
+        '''
+        criteria = ((self.__by_class, class_assigned),
+                    (self.__by_grade, grade_level),
+                    (self.__by_selected_activity, selected_activity))
+
+        buckets = []
+        for index, key in criteria:
+            if key is not None:
+                bucket = index.get(key)
+                if not bucket:
+                    return []
+                buckets.append(bucket)
+
+        return self.__match(self.__students, buckets)
+
+    def teachers(self, mentor_grade: int = None,
+                 mentor_class: str = None) -> list[Teacher]:
+        '''Returns the teachers that mentor mentor_grade and/or mentor_class'''
+        criteria = ((self.__by_mentor_grade, mentor_grade),
+                    (self.__by_mentor_class, mentor_class))
+
+        buckets = []
+        for index, key in criteria:
+            if key is not None:
+                bucket = index.get(key)
+                if not bucket:
+                    return []
+                buckets.append(bucket)
+
+        return self.__match(self.__teachers, buckets)
+
+    def activities(self) -> list[Activity]:
+        '''Returns all the activities in the order they were registered'''
+        return list(self.__activities.values())
+
+
+# The activity a specialised student can take part in
+ACTIVITY_CLASSES = ((Athlete, SportsTournament), (Artist, TalentShow),
+                    (Scholar, AcademicCompetition))
+
+def enroll_students(students: list[Student],
+                    activities: list[Activity]) -> list[Student]:
+    '''
+    Enrolls students into activities in a single pass and returns the students
+    that could not be placed.
+
+    An Athlete goes to a SportsTournament, an Artist to a TalentShow and a
+    Scholar to an AcademicCompetition, always of the same grade_level as the
+    student, and never beyond the max_participants of the activity (current
+    participants included). Activities are filled in the order they are
+    given. Plain Students have no activity and are never placed. Students
+    already enrolled in one of the activities they could go to, or given
+    more than once, are only placed once and are not reported as unplaced.
+
+    The activities that still have room are kept in a queue per (activity
+    class, grade_level), so each student is placed with one dictionary lookup
+    instead of scanning the activities.
+    '''
+    # Maps (activity class, grade_level) to a queue of
+    # [activity, places left, new participants]
+    open_activities = {}
+    # Maps (activity class, grade_level) to the ids of the students already
+    # enrolled in one of those activities
+    enrolled = {}
+    for activity in activities:
+        key = (type(activity), activity._Activity__grade_level)
+        enrolled.setdefault(key, set()).update(activity._Activity__participant_ids)
+
+        places_left = (activity._Activity__max_participants
+                       - len(activity._Activity__participants))
+        if places_left > 0:
+            open_activities.setdefault(key, deque()).append([activity, places_left, []])
+
+    unplaced = []
+    # Slots of the activities that received new participants
+    filled = []
+    # Ids of the students seen so far
+    seen = set()
+
+    for student in students:
+        if id(student) in seen:
+            # Given twice
+            continue
+        seen.add(id(student))
+
+        activity_class = None
+        for student_class, candidate in ACTIVITY_CLASSES:
+            if isinstance(student, student_class):
+                activity_class = candidate
+                break
+
+        key = (activity_class, student._Student__grade_level)
+        if id(student) in enrolled.get(key, ()):
+            # Already placed
+            continue
+
+        queue = open_activities.get(key)
+        if not queue:
+            unplaced.append(student)
+            continue
+
+        slot = queue[0]
+        if not slot[2]:
+            filled.append(slot)
+        slot[2].append(student)
+        slot[1] -= 1
+        if slot[1] == 0:
+            # The activity is full
+            queue.popleft()
+
+    for activity, _, new_participants in filled:
+        if activity.add_participants_bulk(new_participants) == -1:
+            # The activity refused them
+            unplaced.extend(new_participants)
+
+    return unplaced
+###############################################################################
+
+import tracemalloc
+
+def slot_attributes(cls) -> tuple:
+    '''
+    Returns the names under which the instances of cls store their attributes,
+    from the base class down, with private names mangled (for example
+    "_Student__gpa"), so that they can be given to getattr.
+    '''
+    names = []
+    for klass in reversed(cls.__mro__):
+        for name in klass.__dict__.get("__slots__", ()):
+            if name.startswith("__") and not name.endswith("__"):
+                name = f"_{klass.__name__.lstrip('_')}{name}"
+            names.append(name)
+    return tuple(names)
+
+def benchmark_participant_memory(n_students: int = 1_000_000) -> tuple:
+    '''
+    Measures the memory used by a roster of n_students made up Students with
+    tracemalloc, once as they are (attributes in __slots__) and once copied
+    into plain objects keeping the same attributes in a __dict__, which is
+    how the classes used to store them. Both rosters hold the same values,
+    so the difference is the cost of the layout. Prints and returns the
+    bytes per participant of the dict layout and of the slots layout.
+    '''
+    class DictLayout:
+        '''Same attributes as a Student, stored in a __dict__'''
+
+    names = slot_attributes(Student)
+    activities = ("Sports", "Talent", "Academic")
+
+    def made_up_students():
+        for i in range(n_students):
+            yield Student(f"Student {i}", i, 2000 + i % 15, 1 + i % 12,
+                          1 + i % 28, "Male" if i % 2 else "Female",
+                          1 + i % 12, "ABCD"[i % 4], (i % 101) / 10,
+                          activities[i % 3], float(i % 97), float(i % 89),
+                          float(i % 83))
+
+    def as_dict_layout(student):
+        copy = DictLayout()
+        for name in names:
+            setattr(copy, name, getattr(student, name))
+        return copy
+
+    measures = []
+    for build in (lambda: [as_dict_layout(s) for s in made_up_students()],
+                  lambda: list(made_up_students())):
+        tracemalloc.start()
+        roster = build()
+        measures.append(tracemalloc.get_traced_memory()[0] / n_students)
+        tracemalloc.stop()
+        del roster
+
+    dict_bytes, slots_bytes = measures
+    print(f"Students:\t\t{n_students}")
+    print(f"__dict__ layout:\t{dict_bytes:.0f} bytes per participant")
+    print(f"__slots__ layout:\t{slots_bytes:.0f} bytes per participant")
+    print(f"Saving:\t\t\t{1 - slots_bytes/dict_bytes:.0%}")
+    return (dict_bytes, slots_bytes)
+
+def export_values(objs):
+    '''
+    Yields get_values() of every participant or activity of objs, for example
+    all the students of a Registry, in order. The cached values are used when
+    there are some. The others are read in a single attrgetter call per object
+    and are not cached, so exporting a whole roster once does not keep a
+    tuple alive for every object.
+    '''
+    for obj in objs:
+        if isinstance(obj, Activity):
+            values = obj._cached_values()
+        else:
+            values = obj._Observable__values
+        yield values if values is not None else obj._build_values()
+###############################################################################
+
+import json
+from itertools import tee
+
+# Columns written by write_participants. The optional SPECIALIZATION_COLUMNS
+# come last, so that load_participant_data(promote=True) rebuilds Artists,
+# Athletes and Scholars.
+PARTICIPANT_EXPORT_COLUMNS = PARTICIPANT_COLUMNS + SPECIALIZATION_COLUMNS
+
+# Columns written by write_activities. The last three are ignored by
+# load_activities_data, which always loads inactive activities without
+# participants or organizers.
+ACTIVITY_EXPORT_COLUMNS = ACTIVITY_COLUMNS + ("is_active", "participants",
+                                              "organizers")
+
+# Columns written by write_winners
+WINNER_COLUMNS = ("activity_id", "activity_name", "winner_idi", "winner_name",
+                  "score")
+
+# Size of the buffer used by the writers
+WRITE_BUFFER_SIZE = 1 << 20
+
+def participant_fields(participant: Participant, values: tuple) -> tuple:
+    '''
+    Returns the fields of participant in PARTICIPANT_EXPORT_COLUMNS order,
+    given its get_values(). Fields that do not apply are None.
+    '''
+    if isinstance(participant, Teacher):
+        (name, idi, birth_year, birth_month, birth_day, gender, subject,
+         mentor_grade, mentor_class, judge) = values
+        return (idi, name, birth_year, birth_month, birth_day, gender,
+                None, None, None, None, None, None, None,
+                subject, mentor_grade, mentor_class, judge,
+                None, None, None, None, None)
+
+    # Age and eligible (values[6] and values[14]) are derived, so they are
+    # not written
+    fields = (values[1], values[0]) + values[2:6] + values[7:14] + (None,) * 4
+
+    if isinstance(participant, Artist):
+        return fields + (values[16], None, None, None, None)
+    if isinstance(participant, Athlete):
+        return fields + (None, values[15], values[16], None, None)
+    if isinstance(participant, Scholar):
+        return fields + (None, None, None, values[15], values[16])
+    return fields + (None, None, None, None, None)
+
+def activity_fields(activity: Activity, values: tuple) -> tuple:
+    '''
+    Returns the fields of activity in ACTIVITY_EXPORT_COLUMNS order, given
+    its get_values(). Participants and organizers are given by their idi.
+    Fields that do not apply are None.
+    '''
+    fields = values[:5]
+
+    if isinstance(activity, SportsTournament):
+        fields += (values[8], values[9], None, None, None)
+    elif isinstance(activity, TalentShow):
+        fields += (None, None, values[8], None, None)
+    elif isinstance(activity, AcademicCompetition):
+        fields += (None, None, None, values[8], values[9])
+    else:
+        fields += (None, None, None, None, None)
+
+    return fields + (values[5],
+                     [p.idi for p in activity._Activity__participants],
+                     [o.idi for o in activity._Activity__organizers])
+
+def winner_fields(activity: Activity) -> tuple:
+    '''
+    Returns the winner of activity in WINNER_COLUMNS order. The winner
+    fields are None if the activity has no winner.
+    '''
+    winner = activity.determine_winner()
+    if winner == -1:
+        return (activity.activity_id, activity.activity_name, None, None, None)
+
+    return (activity.activity_id, activity.activity_name, winner.idi,
+            winner.name, winner.compute_scores())
+
+def csv_field(value):
+    '''
+    Formats one field the way the loaders read it back: None is an empty
+    field, booleans are TRUE or FALSE and lists are joined by "-".
+    '''
+    if value is None:
+        return ""
+    if value is True:
+        return "TRUE"
+    if value is False:
+        return "FALSE"
+    if type(value) == list:
+        return "-".join(str(item) for item in value)
+    return value
+
+def write_records(filepath: str, columns: tuple, records,
+                  file_format: str = None) -> int:
+    '''
+    Writes records (an iterable of tuples in columns order, for example a
+    generator) to filepath as csv with a header, or as JSON Lines with one
+    object per record. file_format is "csv" or "jsonl". If it is None, it is
+    "jsonl" for a .jsonl or .json file and "csv" otherwise.
+
+    Records are written one at a time through a large buffer, so memory use
+    does not depend on the number of records. Returns the number of records
+    written, or -1 if file_format is invalid.
+    '''
+    if file_format is None:
+        file_format = ("jsonl" if filepath.endswith((".jsonl", ".json"))
+                       else "csv")
+
+    if file_format not in ("csv", "jsonl"):
+        # Invalid input
+        return -1
+
+    count = 0
+    with open(filepath, 'w', newline='', buffering=WRITE_BUFFER_SIZE) as f:
+        if file_format == "csv":
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            for record in records:
+                writer.writerow([csv_field(value) for value in record])
+                count += 1
+        else:
+            encode = json.JSONEncoder().encode
+            for record in records:
+                f.write(encode(dict(zip(columns, record))))
+                f.write("\n")
+                count += 1
+
+    return count
+
+def write_participants(filepath: str, participants,
+                       file_format: str = None) -> int:
+    '''
+    Writes Students (including Artists, Athletes and Scholars) and Teachers
+    to filepath, in PARTICIPANT_EXPORT_COLUMNS. A csv file is read back by
+    load_participant_data. participants can be any iterable, for example the
+    chain of the students and teachers of a Registry. Returns the number of
+    participants written, or -1 if file_format is invalid (see write_records).
+    '''
+    # participants is only read once, so it can be a generator
+    participants, others = tee(participants)
+    return write_records(filepath, PARTICIPANT_EXPORT_COLUMNS,
+                         map(participant_fields, others,
+                             export_values(participants)),
+                         file_format)
+
+def write_activities(filepath: str, activities, file_format: str = None) -> int:
+    '''
+    Writes activities to filepath, in ACTIVITY_EXPORT_COLUMNS. A csv file is
+    read back by load_activities_data. Returns the number of activities
+    written, or -1 if file_format is invalid (see write_records).
+    '''
+    activities, others = tee(activities)
+    return write_records(filepath, ACTIVITY_EXPORT_COLUMNS,
+                         map(activity_fields, others,
+                             export_values(activities)),
+                         file_format)
+
+def write_winners(filepath: str, activities, file_format: str = None) -> int:
+    '''
+    Determines the winner of every activity (SportsTournaments, TalentShows
+    and AcademicCompetitions) and writes them to filepath, in WINNER_COLUMNS.
+    Returns the number of activities written, or -1 if file_format is invalid
+    (see write_records).
+    '''
+    return write_records(filepath, WINNER_COLUMNS,
+                         map(winner_fields, activities), file_format)
+###############################################################################
+
+class UpdateBatch:
+    def __init__(self, updates=()):
+        '''
+        Constructs an UpdateBatch, a group of set_values updates on many
+        participants (for example the results sheet of the judges) that is
+        applied all at once or not at all, and can be rolled back.
+
+        updates is an iterable of (participant, data_attributes) pairs, more
+        can be added with add. The updates of one participant are merged in
+        order and checked against it with the same compiled validator as
+        set_values. Each participant is then set in one pass and its derived
+        attributes (age, eligible, performance_level) are updated once,
+        however many updates it has.
+        '''
+        # (participant, data_attributes) in the order they were added
+        self.__updates = []
+
+        # (participant, merged data_attributes, old attribute values) of
+        # every participant changed by apply, None when not applied
+        self.__applied = None
+
+        for participant, data_attributes in updates:
+            self.add(participant, data_attributes)
+
+    def __len__(self) -> int:
+        '''Returns the number of updates in the batch'''
+        return len(self.__updates)
+
+    def add(self, participant: Participant, data_attributes: dict) -> None:
+        '''
+        Adds one update to the batch. Returns -1 if participant is not a
+        Participant, data_attributes is not a dict or the batch has already
+        been applied.
+        '''
+        if (not isinstance(participant, Participant)
+            or type(data_attributes) != dict or self.__applied is not None):
+            # Invalid input
+            return -1
+
+        self.__updates.append((participant, data_attributes))
+
+    def __merge(self) -> tuple:
+        '''
+        Merges the updates of every participant and validates them. Returns
+        (merged, invalid) where merged maps id(participant) to the
+        participant and its merged data_attributes, and invalid holds the
+        positions of the updates that fail validation. Invalid updates are
+        left out of merged.
+        '''
+        merged = {}
+        invalid = []
+
+        for position, (participant, data_attributes) in enumerate(self.__updates):
+            entry = merged.get(id(participant))
+            if entry is None:
+                candidate = data_attributes
+            else:
+                candidate = {**entry[1], **data_attributes}
+
+                # A later update of one of two linked attributes (such as
+                # talent_score and performance_level) replaces the earlier
+                # value of the other one
+                for key in data_attributes:
+                    mirror = participant._mirrors.get(key)
+                    if (mirror is not None and mirror[0] in entry[1]
+                        and mirror[0] not in data_attributes):
+                        del candidate[mirror[0]]
+
+            if not participant._validate(participant, candidate):
+                invalid.append(position)
+                continue
+
+            merged[id(participant)] = (participant, candidate)
+
+        return (merged, invalid)
+
+    def validate(self) -> list[int]:
+        '''
+        Returns the positions of the updates that are invalid, given the
+        updates of the same participant before them. An empty list means
+        that apply will succeed.
+        '''
+        return self.__merge()[1]
+
+    def apply(self) -> None:
+        '''
+        Applies every update of the batch. Returns -1 and changes nothing if
+        any update is invalid (see validate) or the batch has already been
+        applied.
+        '''
+        if self.__applied is not None:
+            # Fail condition
+            return -1
+
+        merged, invalid = self.__merge()
+        if invalid:
+            # Invalid input
+            return -1
+
+        applied = []
+        try:
+            for participant, data_attributes in merged.values():
+                # Remember the old value of every attribute the update sets,
+                # including the linked ones
+                attributes = participant._attributes
+                names = set()
+                for key in data_attributes:
+                    if key in attributes:
+                        names.add(attributes[key])
+                        mirror = participant._mirrors.get(key)
+                        if mirror is not None:
+                            names.add(attributes[mirror[0]])
+                old_values = [(name, getattr(participant, name)) for name in names]
+                applied.append((participant, data_attributes, old_values))
+
+                participant._update_derived(
+                    data_attributes, *participant._assign_values(data_attributes))
+        except BaseException:
+            # Leave every participant as it was before the batch
+            UpdateBatch.__restore(applied)
+            raise
+
+        self.__applied = applied
+
+    def rollback(self) -> None:
+        '''
+        Puts back the values every participant had before apply. Returns -1
+        if the batch has not been applied. The batch can be applied again
+        afterwards.
+        '''
+        if self.__applied is None:
+            # Fail condition
+            return -1
+
+        UpdateBatch.__restore(self.__applied)
+        self.__applied = None
+
+    @staticmethod
+    def __restore(applied: list) -> None:
+        '''Puts back the old values recorded by apply, last change first'''
+        for participant, data_attributes, old_values in reversed(applied):
+            for name, value in old_values:
+                setattr(participant, name, value)
+                if name == "_Participant__name":
+                    Participant._names_version += 1
+
+            # The derived attributes follow the restored values
+            participant._update_derived(data_attributes, True, True)
+###############################################################################
+
+import contextlib
+import random
+import threading
+
+# Number of locks a ConcurrentRegistry spreads the participants over
+LOCK_STRIPES = 64
+
+class ConcurrentRegistry(Registry):
+    def __init__(self, students: list[Student] = (),
+                 teachers: list[Teacher] = (), activities: list[Activity] = (),
+                 stripes: int = LOCK_STRIPES):
+        '''
+        Constructs a ConcurrentRegistry, a Registry whose objects can be read
+        and updated from many threads through its methods.
+
+        Participants are spread over a fixed number of striped locks, so two
+        threads updating different participants rarely wait for each other.
+        Every activity has its own lock, taken when one of its participants
+        tells it about a change, and the indexes of the registry have one
+        lock held only while an object is refiled. Locks are always taken
+        in the order participant stripes, then activity, then indexes.
+
+        Reads that cover many participants (a winner computed without a
+        leaderboard, rank, the values of an activity) hold every stripe, so
+        they see a consistent snapshot in which no update is half applied.
+        A winner read from a leaderboard only needs the activity lock.
+        '''
+        self.__stripes = [threading.Lock() for _ in range(stripes)]
+        self.__index_lock = threading.Lock()
+
+        super().__init__(students, teachers, activities)
+
+    def __stripe(self, participant: Participant) -> int:
+        '''Returns the position of the lock of participant in the stripes'''
+        # id() is used rather than idi, which set_values can change. Objects
+        # are aligned on 16 bytes, so the low bits are dropped.
+        return (id(participant) >> 4) % len(self.__stripes)
+
+    @contextlib.contextmanager
+    def __locked(self, participants=(), every_stripe: bool = False,
+                 activity: Activity = None):
+        '''
+        Holds the stripes of participants (or every stripe), then the lock of
+        activity if it is given.
+        '''
+        if every_stripe:
+            locks = list(self.__stripes)
+        else:
+            # Stripes are always taken in the order of their position, which
+            # avoids deadlocks
+            locks = [self.__stripes[stripe] for stripe in
+                     sorted({self.__stripe(p) for p in participants})]
+
+        if activity is not None and activity._Activity__lock is not None:
+            locks.append(activity._Activity__lock)
+
+        for lock in locks:
+            lock.acquire()
+        try:
+            yield
+        finally:
+            for lock in reversed(locks):
+                lock.release()
+
+    def _observed_changed(self, obj) -> None:
+        '''Refiles obj, holding the lock of the indexes'''
+        with self.__index_lock:
+            super()._observed_changed(obj)
+
+    def add_participant(self, participant: Participant) -> None:
+        '''Adds participant to the registry. Returns -1 if it is invalid.'''
+        with self.__locked((participant,)), self.__index_lock:
+            return super().add_participant(participant)
+
+    def remove_participant(self, participant: Participant) -> None:
+        '''Removes participant. Returns -1 if it is not in the registry.'''
+        with self.__locked((participant,)), self.__index_lock:
+            return super().remove_participant(participant)
+
+    def add_activity(self, activity: Activity) -> None:
+        '''
+        Adds activity to the registry and gives it its own lock. Returns -1
+        if it is invalid.
+        '''
+        with self.__index_lock:
+            if super().add_activity(activity) == -1:
+                # Invalid input
+                return -1
+
+        if activity._Activity__lock is None:
+            activity._Activity__lock = threading.RLock()
+
+    def remove_activity(self, activity: Activity) -> None:
+        '''Removes activity. Returns -1 if it is not in the registry.'''
+        with self.__index_lock:
+            if super().remove_activity(activity) == -1:
+                # Invalid input
+                return -1
+
+        activity._Activity__lock = None
+
+    def participant(self, idi: int) -> Participant:
+        '''Returns the participant with idi, or -1 if there is none'''
+        with self.__index_lock:
+            return super().participant(idi)
+
+    def activity(self, activity_id: int) -> Activity:
+        '''Returns the activity with activity_id, or -1 if there is none'''
+        with self.__index_lock:
+            return super().activity(activity_id)
+
+    def students(self, class_assigned: str = None, grade_level: int = None,
+                 selected_activity: str = None) -> list[Student]:
+        '''Returns the students matching every given key, see Registry'''
+        with self.__index_lock:
+            return super().students(class_assigned, grade_level,
+                                    selected_activity)
+
+    def teachers(self, mentor_grade: int = None,
+                 mentor_class: str = None) -> list[Teacher]:
+        '''Returns the teachers matching every given key, see Registry'''
+        with self.__index_lock:
+            return super().teachers(mentor_grade, mentor_class)
+
+    def activities(self) -> list[Activity]:
+        '''Returns every activity'''
+        with self.__index_lock:
+            return super().activities()
+
+    def set_values(self, obj, data_attributes: dict) -> None:
+        '''
+        Calls set_values on a participant holding its stripe, or on an
+        activity holding every stripe and its lock, since it can change its
+        participants. Returns what set_values returns.
+        '''
+        if isinstance(obj, Activity):
+            with self.__locked(every_stripe=True, activity=obj):
+                return obj.set_values(data_attributes)
+
+        with self.__locked((obj,)):
+            return obj.set_values(data_attributes)
+
+    def bulk_set_values(self, objs, updates) -> list[int]:
+        '''
+        Applies updates[i] to objs[i] like set_values, each under its own
+        lock. Returns the positions of the invalid updates.
+        '''
+        invalid = []
+        for position, (obj, data_attributes) in enumerate(zip(objs, updates)):
+            if self.set_values(obj, data_attributes) == -1:
+                invalid.append(position)
+        return invalid
+
+    def get_values(self, obj) -> tuple:
+        '''Returns obj.get_values(), never half way through an update'''
+        if isinstance(obj, Activity):
+            with self.__locked(every_stripe=True, activity=obj):
+                return obj.get_values()
+
+        with self.__locked((obj,)):
+            return obj.get_values()
+
+    def determine_winner(self, activity: Activity) -> Student:
+        '''
+        Returns activity.determine_winner(). When the winner comes from the
+        leaderboard only the activity is locked, otherwise the scores are
+        read from a consistent snapshot.
+        '''
+        uses_leaderboard = (activity._Activity__leaderboard is not None
+                            and not (isinstance(activity, SportsTournament)
+                                     and activity._SportsTournament__game_type == "Team"))
+
+        with self.__locked(every_stripe=not uses_leaderboard, activity=activity):
+            return activity.determine_winner()
+
+    def compute_scores(self, participant: Student) -> float:
+        '''Returns participant.compute_scores(), holding its stripe'''
+        with self.__locked((participant,)):
+            return participant.compute_scores()
+
+    def rank(self, activity: Activity, k: int = None,
+             class_assigned: str = None) -> list:
+        '''Returns activity.rank(k, class_assigned) from a consistent snapshot'''
+        with self.__locked(every_stripe=True, activity=activity):
+            return activity.rank(k, class_assigned)
+
+    def add_participants(self, activity: Activity,
+                         participants: list[Student]) -> None:
+        '''
+        Calls activity.add_participants_bulk(participants), holding the
+        stripes of participants and the lock of activity.
+        '''
+        with self.__locked(participants, activity=activity):
+            return activity.add_participants_bulk(participants)
+
+    def remove_participant_from(self, activity: Activity,
+                                participant: Student) -> None:
+        '''Calls activity.remove_participant(participant) under the locks'''
+        with self.__locked((participant,), activity=activity):
+            return activity.remove_participant(participant)
+
+
+def stress_test_registry(n_students: int = 10_000,
+                         thread_counts: tuple = (1, 2, 4, 8),
+                         updates_per_thread: int = 20_000) -> dict:
+    '''
+    Updates the talent_score of random Artists of a ConcurrentRegistry from
+    several threads at once, while every thread also reads a winner every
+    100 updates. Runs once per number of threads in thread_counts, then
+    checks that every winner matches the one computed from scratch. Prints
+    and returns the updates per second for each number of threads.
+
+    With a CPython that has a global interpreter lock only one thread runs
+    Python code at a time, so the throughput can at best stay level as
+    threads are added. What the striped locks guarantee is that the
+    registry locks do not become the bottleneck, which is what lets it grow
+    with the number of threads on a free-threaded build.
+    '''
+    artists = [Artist(f"Artist {i}", i, 2000 + i % 8, 1 + i % 12, 1 + i % 28,
+                      "Male" if i % 2 else "Female", 1 + i % 12, "ABCD"[i % 4],
+                      6.0 + (i % 40) / 10, "Talent", float(i % 97),
+                      float(i % 89), float(i % 83), "Dance")
+               for i in range(n_students)]
+
+    # Eight talent shows, each with its own leaderboard
+    shows = [TalentShow(number, f"Show {number}", "Talent", n_students, 1,
+                        True, artists[number::8], [], ["Dance"])
+             for number in range(8)]
+    for show in shows:
+        show.enable_leaderboard()
+
+    registry = ConcurrentRegistry(artists, (), shows)
+
+    def worker(seed: int) -> None:
+        generator = random.Random(seed)
+        for update in range(updates_per_thread):
+            artist = artists[generator.randrange(n_students)]
+            registry.set_values(artist, {"talent_score": generator.uniform(0.0, 100.0)})
+            if update % 100 == 0:
+                registry.determine_winner(shows[generator.randrange(len(shows))])
+
+    results = {}
+    for thread_count in thread_counts:
+        threads = [threading.Thread(target=worker, args=(seed,))
+                   for seed in range(thread_count)]
+
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        seconds = time.perf_counter() - start
+
+        results[thread_count] = thread_count * updates_per_thread / seconds
+        print(f"Threads: {thread_count}\t{results[thread_count]:.0f} updates/s")
+
+    for show in shows:
+        if (registry.determine_winner(show)
+            is not winner_from_participants(show._Activity__participants)):
+            # Fail condition
+            print("Inconsistent winner")
+            return -1
+
+    return results
+###############################################################################
+
+import asyncio
+from urllib.parse import urlsplit, parse_qs
+
+class EventService:
+    def __init__(self, registry: ConcurrentRegistry):
+        '''
+        Constructs an EventService, the asyncio interface of the activity
+        engine used on event day.
+
+        Every coroutine runs the engine (set_values, add_participants_bulk,
+        determine_winner, rank) in a worker thread through the locks of the
+        ConcurrentRegistry, so the event loop keeps serving requests while a
+        large activity is scored. Winner and ranking queries are coalesced:
+        while one computation for an activity is running, identical queries
+        wait for its result instead of starting their own.
+        '''
+        self.__registry = registry
+
+        # Running computations, by (query, arguments)
+        self.__pending = {}
+
+    @property
+    def registry(self) -> ConcurrentRegistry:
+        '''Returns the registry served'''
+        return self.__registry
+
+    async def __coalesced(self, key: tuple, function, *args):
+        '''
+        Returns function(*args), computed in a worker thread. Calls made
+        with the same key while it is running share its result.
+        '''
+        task = self.__pending.get(key)
+        if task is None:
+            task = asyncio.ensure_future(asyncio.to_thread(function, *args))
+            self.__pending[key] = task
+            task.add_done_callback(lambda _: self.__pending.pop(key, None))
+
+        # shield keeps a cancelled caller from cancelling the shared task
+        return await asyncio.shield(task)
+
+    def __winner_record(self, activity: Activity):
+        '''Returns (idi, name, score) of the winner of activity, or -1'''
+        winner = self.__registry.determine_winner(activity)
+        if winner == -1:
+            # Fail condition
+            return -1
+        return (winner.idi, winner.name, self.__registry.compute_scores(winner))
+
+    def __rank_records(self, activity: Activity, k: int, class_assigned: str):
+        '''Returns (idi, name, score) of the ranked participants, or -1'''
+        ranking = self.__registry.rank(activity, k, class_assigned)
+        if ranking == -1:
+            # Invalid input
+            return -1
+        return [(p.idi, p.name, self.__registry.compute_scores(p))
+                for p in ranking]
+
+    async def winner(self, activity_id: int):
+        '''
+        Returns (idi, name, score) of the current winner of the activity
+        with activity_id, or -1 if there is no such activity or no winner.
+        '''
+        activity = self.__registry.activity(activity_id)
+        if activity == -1:
+            # Invalid input
+            return -1
+        return await self.__coalesced(("winner", activity_id),
+                                      self.__winner_record, activity)
+
+    async def rank(self, activity_id: int, k: int = None,
+                   class_assigned: str = None):
+        '''
+        Returns the (idi, name, score) of the participants of the activity
+        with activity_id from best to worst, like Activity.rank. Returns -1 if
+        there is no such activity or k is invalid.
+        '''
+        activity = self.__registry.activity(activity_id)
+        if activity == -1:
+            # Invalid input
+            return -1
+        return await self.__coalesced(("rank", activity_id, k, class_assigned),
+                                      self.__rank_records, activity, k,
+                                      class_assigned)
+
+    async def enroll(self, activity_id: int, idis: list[int]) -> None:
+        '''
+        Adds the participants with idis to the activity with activity_id, all
+        of them or none. Returns -1 if the activity or a participant does not
+        exist, or if the activity refuses them (see add_participants_bulk).
+        '''
+        activity = self.__registry.activity(activity_id)
+        participants = [self.__registry.participant(idi) for idi in idis]
+        if activity == -1 or any(p == -1 for p in participants):
+            # Invalid input
+            return -1
+        return await asyncio.to_thread(self.__registry.add_participants,
+                                       activity, participants)
+
+    async def update_scores(self, updates: list[tuple]) -> list[int]:
+        '''
+        Applies updates, a list of (idi, data_attributes) pairs, with
+        set_values. Returns the positions of the updates that were refused,
+        because the participant does not exist or the values are invalid.
+        '''
+        participants = [self.__registry.participant(idi) for idi, _ in updates]
+        missing = [position for position, p in enumerate(participants) if p == -1]
+
+        found = [position for position, p in enumerate(participants) if p != -1]
+        invalid = await asyncio.to_thread(
+            self.__registry.bulk_set_values,
+            [participants[position] for position in found],
+            [updates[position][1] for position in found])
+
+        return sorted(missing + [found[position] for position in invalid])
+
+
+# Reason phrases of the status codes used by the HTTP front end
+HTTP_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found",
+                405: "Method Not Allowed", 500: "Internal Server Error"}
+
+def parse_number(text: str) -> int:
+    '''
+    Returns the non-negative integer written in text with ASCII digits, or
+    -1. str.isdigit alone also accepts digits such as "²" that int refuses.
+    '''
+    if not (text.isascii() and text.isdigit()):
+        # Invalid input
+        return -1
+
+    try:
+        return int(text)
+    except ValueError:
+        # Invalid input
+        return -1
+
+def ranking_json(records: list) -> list:
+    '''Turns (idi, name, score) records into JSON objects'''
+    return [{"idi": idi, "name": name, "score": score}
+            for idi, name, score in records]
+
+async def handle_http_request(service: EventService, method: str, target: str,
+                              body: bytes) -> tuple:
+    '''
+    Serves one request of the HTTP front end and returns (status, object),
+    where object is sent back as JSON:
+
+    GET  /activities/<id>/winner                 current winner
+    GET  /activities/<id>/rank?k=3&class=A       ranking, k and class optional
+    POST /activities/<id>/participants           body {"idis": [...]}
+    POST /scores                                 body {"updates": [{"idi": 1,
+                                                 "talent_score": 50.0}, ...]}
+    '''
+    url = urlsplit(target)
+    parts = [part for part in url.path.split("/") if part]
+
+    try:
+        data = json.loads(body) if body else {}
+    except ValueError:
+        return (400, {"error": "invalid JSON"})
+
+    if parts == ["scores"]:
+        if method != "POST":
+            return (405, {"error": "use POST"})
+        updates = data.get("updates") if type(data) == dict else None
+        if type(updates) != list or not all(type(u) == dict and type(u.get("idi")) == int
+                                            for u in updates):
+            return (400, {"error": "expected {\"updates\": [{\"idi\": ...}, ...]}"})
+        pairs = [(u["idi"], {key: value for key, value in u.items() if key != "idi"})
+                 for u in updates]
+        return (200, {"invalid": await service.update_scores(pairs)})
+
+    if len(parts) != 3 or parts[0] != "activities" or parse_number(parts[1]) == -1:
+        return (404, {"error": "unknown path"})
+
+    activity_id = int(parts[1])
+
+    if service.registry.activity(activity_id) == -1:
+        return (404, {"error": f"unknown activity {activity_id}"})
+
+    if parts[2] == "winner" and method == "GET":
+        record = await service.winner(activity_id)
+        if record == -1:
+            return (200, {"activity_id": activity_id, "winner": None})
+        return (200, {"activity_id": activity_id, "winner": ranking_json([record])[0]})
+
+    if parts[2] == "rank" and method == "GET":
+        query = parse_qs(url.query)
+        k = query.get("k", [None])[0]
+        if k is not None:
+            k = parse_number(k)
+            if k == -1:
+                return (400, {"error": "k must be a number"})
+        records = await service.rank(activity_id, k, query.get("class", [None])[0])
+        if records == -1:
+            return (400, {"error": "invalid ranking"})
+        return (200, {"activity_id": activity_id, "ranking": ranking_json(records)})
+
+    if parts[2] == "participants" and method == "POST":
+        idis = data.get("idis") if type(data) == dict else None
+        if type(idis) != list or not all(type(idi) == int for idi in idis):
+            return (400, {"error": "expected {\"idis\": [...]}"})
+        if await service.enroll(activity_id, idis) == -1:
+            return (400, {"error": "enrollment refused"})
+        return (200, {"activity_id": activity_id, "enrolled": idis})
+
+    return (404, {"error": "unknown path"})
+
+async def serve_http(service: EventService, host: str = "127.0.0.1",
+                     port: int = 0, path: str = None) -> asyncio.AbstractServer:
+    '''
+    Starts the HTTP/1.1 front end of service on host and port (port 0 picks
+    a free port), or on the Unix socket at path if it is given. Every
+    connection carries one request. Returns the started asyncio server.
+    '''
+    async def connection(reader: asyncio.StreamReader,
+                         writer: asyncio.StreamWriter) -> None:
+        try:
+            request_line = (await reader.readline()).decode("latin-1").split()
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode("latin-1").strip()
+                if not line:
+                    break
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+            length = parse_number(headers.get("content-length", "0"))
+            body = await reader.readexactly(length) if length > 0 else b""
+
+            if len(request_line) < 2:
+                status, reply = (400, {"error": "invalid request line"})
+            elif length == -1:
+                status, reply = (400, {"error": "invalid Content-Length"})
+            else:
+                try:
+                    status, reply = await handle_http_request(
+                        service, request_line[0].upper(), request_line[1], body)
+                except Exception as error:
+                    # Unexpected failure of the handler or of the engine, the
+                    # client still gets an answer
+                    status, reply = (500, {"error": f"internal error: {type(error).__name__}"})
+
+            payload = json.dumps(reply).encode()
+            writer.write(f"HTTP/1.1 {status} {HTTP_REASONS[status]}\r\n"
+                         f"Content-Type: application/json\r\n"
+                         f"Content-Length: {len(payload)}\r\n"
+                         f"Connection: close\r\n\r\n".encode("latin-1") + payload)
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            # The client went away
+            pass
+        finally:
+            writer.close()
+
+    if path is not None:
+        return await asyncio.start_unix_server(connection, path=path)
+    return await asyncio.start_server(connection, host, port)
+
+async def http_request(method: str, target: str, body=None,
+                       host: str = "127.0.0.1", port: int = None,
+                       path: str = None) -> tuple:
+    '''
+    Sends one request to a server started by serve_http, on host and port or
+    on the Unix socket at path, and returns (status, object). body is sent
+    as JSON. Used to try the front end without any external client.
+    '''
+    if path is not None:
+        reader, writer = await asyncio.open_unix_connection(path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+
+    payload = b"" if body is None else json.dumps(body).encode()
+    writer.write(f"{method} {target} HTTP/1.1\r\n"
+                 f"Host: {host}\r\n"
+                 f"Content-Type: application/json\r\n"
+                 f"Content-Length: {len(payload)}\r\n\r\n".encode("latin-1") + payload)
+    await writer.drain()
+
+    response = await reader.read()
+    writer.close()
+
+    head, _, content = response.partition(b"\r\n\r\n")
+    status = int(head.split(None, 2)[1])
+    return (status, json.loads(content))
+###############################################################################
+
+from itertools import accumulate, chain
+
+# Number of participants from which compute_all_winners uses a pool of
+# processes when it is not given a number of workers
+POOL_MIN_ROWS = 100000
+
+# Kind of the participants of each activity class whose winner can be
+# computed by a worker, with the attributes of its score
+PAYLOAD_ATTRIBUTES = {
+    SportsTournament: (KIND_ATHLETE, "_Athlete__performance_level",
+                       "_Athlete__fitness_score", None),
+    TalentShow: (KIND_ARTIST, "_Artist__performance_level", None, None),
+    AcademicCompetition: (KIND_SCHOLAR, "_Scholar__performance_level", None,
+                          "_Scholar__olympiad_scores")}
+
+def winner_payload(activity: Activity) -> tuple:
+    '''
+    Returns the compact payload compute_all_winners sends to a worker for
+    activity: (mode, kind, ids, gpas, ages, performance_levels, fitness_scores,
+    olympiad_scores, olympiad_offsets, class_codes). Returns None if the
+    winner has to be computed in this process instead.
+
+    The payload holds the raw attributes the eligibility and the score
+    depend on, as arrays which pickle as raw bytes, so the workers do the
+    scoring. mode is "Individual", "Team", or None when determine_winner
+    would fail whatever the scores. The olympiad scores of all the rows are
+    stored one after the other, like in ParticipantTable. fitness_scores,
+    olympiad_scores and olympiad_offsets are None when the kind has no such
+    attribute, and class_codes numbers the teams of a Team SportsTournament.
+    '''
+    attributes = PAYLOAD_ATTRIBUTES.get(type(activity))
+    if attributes is None or activity._Activity__leaderboard is not None:
+        # Unknown activity class, or a leaderboard already knows the winner
+        return None
+
+    participants = activity._Activity__participants
+    participant_class = activity.participant_class
+    if any(type(p) is not participant_class for p in participants):
+        # A subclass could score its participants differently
+        return None
+
+    kind, performance_level, fitness_score, olympiad_scores = attributes
+
+    mode = "Individual"
+    if isinstance(activity, SportsTournament):
+        mode = activity._SportsTournament__game_type
+        if mode not in ("Individual", "Team"):
+            # Invalid game type
+            mode = None
+
+    fitness_scores = None
+    if fitness_score is not None:
+        fitness_scores = array('d', map(operator.attrgetter(fitness_score),
+                                        participants))
+
+    flat_scores = None
+    offsets = None
+    if olympiad_scores is not None:
+        scores = list(map(operator.attrgetter(olympiad_scores), participants))
+        flat_scores = array('d', chain.from_iterable(scores))
+        offsets = array('q', accumulate(map(len, scores), initial=0))
+
+    class_codes = None
+    if mode == "Team":
+        codes = {}
+        class_codes = array('l', [codes.setdefault(p._Student__class_assigned, len(codes))
+                                  for p in participants])
+
+    return (mode, kind,
+            array('q', map(operator.attrgetter("idi"), participants)),
+            array('d', map(operator.attrgetter("_Student__gpa"), participants)),
+            array('q', map(operator.attrgetter("_Student__age"), participants)),
+            array('d', map(operator.attrgetter(performance_level), participants)),
+            fitness_scores, flat_scores, offsets, class_codes)
+
+def winners_from_payloads(payloads: list[tuple]) -> list[int]:
+    '''
+    Computes the winner of every payload made by winner_payload and returns
+    their idis, with -1 when there is no winner. Eligibility and scores follow
+    the is_eligible and compute_scores methods of the participants. This is
+    the part of compute_all_winners that runs in the workers.
+    '''
+    winners = []
+    for (mode, kind, ids, gpas, ages, performance_levels, fitness_scores,
+         olympiad_scores, olympiad_offsets, class_codes) in payloads:
+        if kind == KIND_ARTIST:
+            eligible = [gpa > 6.0 and age >= 16 for gpa, age in zip(gpas, ages)]
+            scores = performance_levels
+        elif kind == KIND_ATHLETE:
+            eligible = [gpa > 5.5 and age >= 12 for gpa, age in zip(gpas, ages)]
+            scores = array('d', map(operator.mul, fitness_scores,
+                                    performance_levels))
+        else:
+            rows = [olympiad_scores[start:end].tolist() for start, end
+                    in zip(olympiad_offsets, olympiad_offsets[1:])]
+            eligible = [gpa > 8.0 and age >= 10 and any([score > 80 for score in row])
+                        for gpa, age, row in zip(gpas, ages, rows)]
+            scores = array('d', [sum(row) * performance_level for row,
+                                 performance_level in zip(rows, performance_levels)])
+
+        if mode == "Team":
+            row = select_team_winner(scores, ids, class_codes, eligible)
+        elif mode == "Individual":
+            row = select_winner(scores, ids, eligible)
+        else:
+            # Fail condition
+            row = -1
+
+        winners.append(-1 if row == -1 else ids[row])
+
+    return winners
+
+def compute_all_winners(activities: list[Activity], workers: int = None) -> dict:
+    '''
+    Returns {activity_id: winner idi} for every activity, with -1 for the
+    activities without a winner. The results are the same as calling
+    determine_winner on every activity one after the other.
+
+    Each activity is turned into a winner_payload, so the workers receive
+    arrays of raw attributes instead of pickled participants, and score them
+    themselves. The payloads are split into one chunk per worker, largest
+    activities first and each one to the chunk with the fewest rows so far,
+    and the chunks are solved in a pool of processes.
+
+    With workers=1, the winners are computed in this process with
+    determine_winner, which reuses the scores cached on the participants.
+    When workers is None, the pool (with one worker per cpu) is only used
+    from POOL_MIN_ROWS participants. Activities without a payload (see
+    winner_payload) are always computed in this process.
+    Returns -1 if workers is not a positive int.
+    '''
+    if workers is not None and (type(workers) != int or workers < 1):
+        # Invalid input
+        return -1
+
+    if workers is None:
+        rows = sum(len(activity._Activity__participants)
+                   for activity in activities)
+        # Below POOL_MIN_ROWS, starting a pool costs more than it saves
+        workers = (os.cpu_count() or 1) if rows >= POOL_MIN_ROWS else 1
+
+    winners = [None] * len(activities)
+    payloads = []
+    positions = []
+    if workers != 1:
+        for position, activity in enumerate(activities):
+            payload = winner_payload(activity)
+            if payload is not None:
+                payloads.append(payload)
+                positions.append(position)
+
+    if len(payloads) > 1:
+        # Balance the chunks by number of rows: (rows, chunk index)
+        chunks = [[] for _ in range(min(workers, len(payloads)))]
+        chunk_positions = [[] for _ in chunks]
+        loads = [(0, i) for i in range(len(chunks))]
+        for payload, position in sorted(zip(payloads, positions),
+                                        key = lambda pair: len(pair[0][2]),
+                                        reverse = True):
+            rows, i = heapq.heappop(loads)
+            chunks[i].append(payload)
+            chunk_positions[i].append(position)
+            heapq.heappush(loads, (rows + len(payload[2]), i))
+
+        with ProcessPoolExecutor(max_workers=len(chunks)) as pool:
+            for chunk, chunk_winners in zip(chunk_positions,
+                                            pool.map(winners_from_payloads, chunks)):
+                for position, winner in zip(chunk, chunk_winners):
+                    winners[position] = winner
+    else:
+        for position, winner in zip(positions, winners_from_payloads(payloads)):
+            winners[position] = winner
+
+    result = {}
+    for activity, winner in zip(activities, winners):
+        if winner is None:
+            # Not computed by a worker
+            winner = activity.determine_winner()
+            winner = -1 if winner == -1 else winner.idi
+        result[activity.activity_id] = winner
+
+    return result
+
+def benchmark_all_winners(activities: list[Activity],
+                          worker_counts: tuple = (1, 2, 4)) -> dict:
+    '''
+    Times compute_all_winners with each number of workers in worker_counts.
+    Prints and returns the times in seconds, keyed by number of workers.
+
+    The cached scores of the participants are cleared before every run, so
+    that each one starts from the same uncached state.
+    '''
+    participants = {id(p): p for activity in activities
+                    for p in activity._Activity__participants}.values()
+
+    times = {}
+    expected = None
+    for workers in worker_counts:
+        for participant in participants:
+            participant._invalidate_cache()
+
+        start = time.perf_counter()
+        winners = compute_all_winners(activities, workers)
+        times[workers] = time.perf_counter() - start
+
+        if expected is None:
+            expected = winners
+        elif winners != expected:
+            print(f"Workers {workers}: winners differ from {worker_counts[0]} worker(s)")
+
+    print(f"Activities:\t\t{len(activities)}")
+    print(f"Participants:\t\t{len(participants)}")
+    for workers in worker_counts:
+        print(f"{workers} worker(s):\t\t{times[workers]:.3f} s")
+    return times
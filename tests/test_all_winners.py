@@ -0,0 +1,81 @@
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Talent_Hunt_Event_Management_System as thems
+
+def make_activities(seed: int = 5) -> list:
+    '''Returns activities of every class, with ties and ineligible students'''
+    generator = random.Random(seed)
+
+    def attributes(i: int, activity: str) -> tuple:
+        return (f"S{i}", i, 2000 + generator.randint(0, 14), 1 + i % 12,
+                1 + i % 28, "Male", 5, "ABC"[generator.randint(0, 2)],
+                generator.choice([4.0, 6.5, 8.5, 9.0]), activity,
+                float(generator.randint(0, 5)), float(generator.randint(0, 5)),
+                1.0)
+
+    activities = []
+    for a in range(12):
+        ids = range(100 * a, 100 * a + 40)
+        if a % 3 == 0:
+            participants = [thems.Artist(*attributes(i, "Talent"), "Dance")
+                            for i in ids]
+            activities.append(thems.TalentShow(a, "Show", "Talent", 100, 5,
+                                               True, participants, [], ["Dance"]))
+        elif a % 3 == 1:
+            participants = [thems.Athlete(*attributes(i, "Sports"), "Run",
+                                          float(generator.randint(1, 3)))
+                            for i in ids]
+            activities.append(thems.SportsTournament(
+                a, "Race", "Sports", 100, 5, True, participants, [],
+                "Team" if a % 2 else "Individual", 30))
+        else:
+            participants = [thems.Scholar(*attributes(i, "Academic"), "Math",
+                                          [float(generator.randint(70, 90))
+                                           for _ in range(generator.randint(0, 3))])
+                            for i in ids]
+            activities.append(thems.AcademicCompetition(
+                a, "Quiz", "Academic", 100, 5, True, participants, [],
+                ["Math"], 100.0))
+
+    # An activity without participants and one that uses its leaderboard
+    activities.append(thems.TalentShow(99, "Empty", "Talent", 10, 5, True, [],
+                                       [], ["Dance"]))
+    activities[0].enable_leaderboard()
+    return activities
+
+def sequential_winners(activities: list) -> dict:
+    winners = {}
+    for activity in activities:
+        winner = activity.determine_winner()
+        winners[activity.activity_id] = -1 if winner == -1 else winner.idi
+    return winners
+
+
+class ComputeAllWinnersTest(unittest.TestCase):
+    def test_same_as_determine_winner(self):
+        activities = make_activities()
+        expected = sequential_winners(activities)
+        for workers in (None, 1, 2, 3):
+            self.assertEqual(thems.compute_all_winners(activities, workers),
+                             expected)
+
+    def test_payloads_in_this_process(self):
+        # The scoring of the workers, without starting a pool
+        activities = make_activities(8)[:-1]
+        payloads = [thems.winner_payload(activity) for activity in activities[1:]]
+        expected = list(sequential_winners(activities[1:]).values())
+        self.assertEqual(thems.winners_from_payloads(payloads), expected)
+        # A leaderboard already knows the winner
+        self.assertIsNone(thems.winner_payload(activities[0]))
+
+    def test_invalid_workers(self):
+        self.assertEqual(thems.compute_all_winners(make_activities(), 0), -1)
+
+
+if __name__ == "__main__":
+    unittest.main()
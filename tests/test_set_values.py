@@ -0,0 +1,178 @@
+import os
+import random
+import sys
+import types
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import Talent_Hunt_Event_Management_System as thems
+
+# Copy of the module as it was before set_values was rewritten around
+# compiled validators
+ORIGINAL_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             "original_talent_hunt.py")
+
+def load_original_module():
+    '''Returns the module saved in ORIGINAL_FILE'''
+    with open(ORIGINAL_FILE, encoding="utf-8") as f:
+        source = f.read()
+
+    module = types.ModuleType("original_talent_hunt")
+    exec(compile(source, ORIGINAL_FILE, "exec"), module.__dict__)
+    return module
+
+def make_student(module, kind: str, i: int):
+    '''Builds a Student, Artist, Athlete or Scholar of module'''
+    activity = {"Student": "Sports", "Artist": "Talent", "Athlete": "Sports",
+                "Scholar": "Academic"}[kind]
+    attributes = (f"N{i}", i, 2005, 3, 4, "Male", 5, "A", 7.5, activity,
+                  50.0, 60.0, 70.0)
+    if kind == "Artist":
+        return module.Artist(*attributes, "Dance")
+    if kind == "Athlete":
+        return module.Athlete(*attributes, "Run", 2.5)
+    if kind == "Scholar":
+        return module.Scholar(*attributes, "Math", [85.0, 70.0])
+    return module.Student(*attributes)
+
+def make_teacher(module, i: int):
+    return module.Teacher(f"T{i}", i, 1980, 1, 1, "Female", "Math", 5, "B", True)
+
+# Values tried for every key, valid and invalid ones
+PARTICIPANT_VALUES = {
+    "name": ["x", 3], "idi": [5, "5", 5.0],
+    "birth_year": [2000, 2010, 1990, "x"], "birth_month": [2, 13, 6],
+    "birth_day": [29, 31, 1], "gender": ["male", "FEMALE", "x", 1],
+    "grade_level": [1, 12, 13, 5.0], "class_assigned": ["C", 1],
+    "gpa": [0.0, 5.0, 5.9, 8.5, 10.0, 11.0, 7, 9.9],
+    "selected_activity": ["Sports", "Talent", "Academic", "Other"],
+    "talent_score": [1.0, 50.0, 2, 50], "athletic_score": [3.0, 50.0, 60.0, "a"],
+    "leadership_score": [1.0, 1],
+    "performance_level": [50.0, 85.0, 99.0, 100.0, 150.0, 60.0, 3, 50, 50.0],
+    "talent": ["Sing", 2], "sports_category": ["Swim", 0],
+    "fitness_score": [1.5, 2], "subject_specialization": ["Bio", 1],
+    "olympiad_scores": [[81.0], [1.0, 2.0], [90], "x", []],
+    "subject": ["Bio", 2], "mentor_grade": [1, 13], "mentor_class": ["Z", 1],
+    "judge": [False, 1], "age": [3], "eligible": [True], "junk": [1]}
+
+ACTIVITY_VALUES = {
+    "activity_id": [1, "1"], "activity_name": ["z", 1],
+    "activity_type": ["Sports", "Talent", "Academic", "x"],
+    "max_participants": [3, 3.0], "grade_level": [2, "2"], "is_active": [True, 1],
+    "game_type": ["Team", "Individual", "x"], "duration_minutes": [5, 5.0],
+    "talent_categories": [["a"], [1], "a"], "subjects": [["m"], [2]],
+    "subject": [["q"]], "max_marks": [10.0, 10]}
+
+
+class SetValuesMatchesOriginalTest(unittest.TestCase):
+    '''Random updates give the same results as the original set_values'''
+
+    @classmethod
+    def setUpClass(cls):
+        cls.original = load_original_module()
+
+    def check_participants(self, make, n_objects: int = 200, n_updates: int = 8):
+        generator = random.Random(7)
+        keys = list(PARTICIPANT_VALUES)
+
+        for i in range(n_objects):
+            new, old = make(thems, i), make(self.original, i)
+            for _ in range(n_updates):
+                data_attributes = {key: generator.choice(PARTICIPANT_VALUES[key])
+                                   for key in generator.sample(keys, generator.randint(1, 3))}
+                try:
+                    expected = old.set_values(dict(data_attributes))
+                except (TypeError, ValueError, OverflowError):
+                    # The original raised instead of returning -1
+                    continue
+
+                with self.subTest(i=i, data_attributes=data_attributes):
+                    self.assertEqual(new.set_values(data_attributes), expected)
+                    if hasattr(old, "is_eligible"):
+                        old.is_eligible()
+                    self.assertEqual(new.get_values(), old.get_values())
+                    if hasattr(old, "compute_scores"):
+                        self.assertEqual(new.compute_scores(), old.compute_scores())
+
+    def test_students(self):
+        for kind in ("Student", "Artist", "Athlete", "Scholar"):
+            self.check_participants(lambda module, i: make_student(module, kind, i))
+
+    def test_teachers(self):
+        self.check_participants(make_teacher)
+
+    def test_activities(self):
+        generator = random.Random(11)
+        keys = list(ACTIVITY_VALUES)
+        arguments = {"SportsTournament": ("Sports", "Individual", 30),
+                     "TalentShow": ("Talent", ["a"]),
+                     "AcademicCompetition": ("Academic", ["m"], 100.0)}
+
+        for name, (activity_type, *extra) in arguments.items():
+            for _ in range(100):
+                new = getattr(thems, name)(1, "n", activity_type, 10, 5, True, [], [], *extra)
+                old = getattr(self.original, name)(1, "n", activity_type, 10, 5, True, [], [], *extra)
+                for _ in range(6):
+                    data_attributes = {key: generator.choice(ACTIVITY_VALUES[key])
+                                       for key in generator.sample(keys, generator.randint(1, 3))}
+                    with self.subTest(activity=name, data_attributes=data_attributes):
+                        self.assertEqual(new.set_values(data_attributes),
+                                         old.set_values(dict(data_attributes)))
+                        self.assertEqual(new.get_values(), old.get_values())
+
+
+class SetValuesTest(unittest.TestCase):
+    def test_linked_score_given_twice(self):
+        # An int performance_level equal to the float score is accepted, and
+        # performance_level takes the value of the score
+        athlete = make_student(thems, "Athlete", 1)
+        self.assertIsNone(athlete.set_values({"athletic_score": 50.0,
+                                              "performance_level": 50}))
+        self.assertEqual(type(athlete.get_values()[-1]), float)
+
+        scholar = make_student(thems, "Scholar", 2)
+        self.assertIsNone(scholar.set_values({"gpa": 9.0, "performance_level": 90}))
+        self.assertEqual(scholar.get_values()[-1], 90.0)
+
+        artist = make_student(thems, "Artist", 3)
+        self.assertEqual(artist.set_values({"talent_score": 50.0,
+                                            "performance_level": 51}), -1)
+        self.assertEqual(artist.set_values({"talent_score": 50.0,
+                                            "performance_level": "50"}), -1)
+
+    def test_birth_year_beyond_datetime(self):
+        student = make_student(thems, "Student", 1)
+        before = student.get_values()
+        self.assertEqual(student.set_values({"birth_year": 10000}), -1)
+        self.assertEqual(student.get_values(), before)
+
+        # Teachers do not compute an age, so they keep accepting such years
+        teacher = make_teacher(thems, 1)
+        self.assertIsNone(teacher.set_values({"birth_year": 10000}))
+
+    def test_assigned_names_clear_cached_values(self):
+        student = make_student(thems, "Student", 1)
+        student.get_values()
+        student.name = "Renamed"
+        student.idi = 700
+        self.assertEqual(student.get_values()[:2], ("Renamed", 700))
+
+        activity = thems.SportsTournament(1, "Race", "Sports", 10, 8, True,
+                                          [student], [], "Individual", 30)
+        activity.get_values()
+        activity.activity_id = 9
+        activity.activity_name = "Relay"
+        self.assertEqual(activity.get_values()[:2], (9, "Relay"))
+
+    def test_bulk_set_values(self):
+        students = [make_student(thems, "Artist", i) for i in range(3)]
+        invalid = thems.bulk_set_values(students, [{"gpa": 1}, {"gpa": 2.0},
+                                                   {"talent_score": "x"}])
+        self.assertEqual(invalid, [0, 2])
+        self.assertEqual(students[1]._Student__gpa, 2.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Talent_Hunt_Event_Management_System as thems
+
+def make_world():
+    '''Returns (students, teachers, activities) using every class'''
+    students = []
+    for i in range(90):
+        kind = i % 4
+        activity = ("Talent", "Sports", "Academic", "Sports")[kind]
+        attributes = (f"S{i}", i, 2004 + i % 5, 1 + i % 12, 1 + i % 28,
+                      "Female" if i % 2 else "Male", 5, "ABC"[i % 3],
+                      4.0 + (i % 60) / 10, activity, float(i % 97),
+                      float(i % 89), float(i % 83))
+        if kind == 0:
+            students.append(thems.Artist(*attributes, "Dance"))
+        elif kind == 1:
+            students.append(thems.Athlete(*attributes, "Run", 1.0 + i % 3))
+        elif kind == 2:
+            students.append(thems.Scholar(*attributes, "Math", [81.0 + i % 19, 40.0]))
+        else:
+            students.append(thems.Student(*attributes))
+
+    # Non-ASCII names and a performance_level set on its own
+    students[4].set_values({"name": "Zoë ✓"})
+    students[2].set_values({"performance_level": 77.5})
+
+    teachers = [thems.Teacher(f"T{i}", 1000 + i, 1975, 6, 1, "Male", "Maths",
+                              5, "A", bool(i % 2)) for i in range(4)]
+
+    athletes = [s for s in students if type(s) is thems.Athlete]
+    artists = [s for s in students if type(s) is thems.Artist]
+    scholars = [s for s in students if type(s) is thems.Scholar]
+    activities = [
+        thems.SportsTournament(1, "Relay", "Sports", 50, 5, True, athletes[:10],
+                               teachers[:2], "Team", 90),
+        thems.SportsTournament(2, "Sprint", "Sports", 50, 5, False, athletes[10:],
+                               [], "Individual", 10),
+        thems.TalentShow(3, "Show", "Talent", 50, 5, True, artists,
+                         teachers[2:], ["Dance", "Song"]),
+        thems.AcademicCompetition(4, "Olympiad", "Academic", 50, 5, True,
+                                  scholars, [teachers[0]], ["Maths"], 100.0)]
+
+    # An Athlete that is only reachable through an activity
+    extra = thems.Athlete("Extra", 500, 2006, 2, 2, "Male", 5, "A", 9.0,
+                          "Sports", 10.0, 99.0, 10.0, "Jump", 3.0)
+    activities[1].add_participant(extra)
+    return (students, teachers, activities, extra)
+
+
+class SnapshotRoundTripTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filepath = os.path.join(self.directory.name, "world.snapshot")
+        self.students, self.teachers, self.activities, self.extra = make_world()
+        thems.save_snapshot(self.filepath, self.students, self.teachers,
+                            self.activities)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        with thems.open_snapshot(self.filepath) as snapshot:
+            # The extra athlete is added after the given students
+            self.assertEqual(len(snapshot.students), len(self.students) + 1)
+            for row, student in enumerate(self.students + [self.extra]):
+                self.assertIs(type(snapshot.students[row]), type(student))
+                self.assertEqual(snapshot.students[row].get_values(), student.get_values())
+
+            self.assertEqual([t.get_values() for t in snapshot.teachers],
+                             [t.get_values() for t in self.teachers])
+
+            for loaded, activity in zip(snapshot.activities, self.activities):
+                self.assertIs(type(loaded), type(activity))
+                self.assertEqual(loaded.get_values(), activity.get_values())
+
+                winner = activity.determine_winner()
+                loaded_winner = loaded.determine_winner()
+                if winner == -1:
+                    self.assertEqual(loaded_winner, -1)
+                else:
+                    self.assertEqual(loaded_winner.idi, winner.idi)
+
+    def test_records_are_shared(self):
+        with thems.open_snapshot(self.filepath) as snapshot:
+            # The participants of an activity are the student records
+            athlete = self.activities[0]._Activity__participants[0]
+            row = self.students.index(athlete)
+            loaded = snapshot.activities[0]._Activity__participants[0]
+            self.assertIs(loaded, snapshot.students[row])
+            self.assertIs(snapshot.students[-1], snapshot.students[len(self.students)])
+
+    def test_reference_date(self):
+        # Ages are kept on the reference date each student was loaded with
+        artist = thems.Artist("A", 1, 2010, 6, 1, "Male", 8, "A", 7.0, "Talent",
+                              50.0, 1.0, 1.0, "Dance", reference_date=(1, 1, 2030))
+        thems.save_snapshot(self.filepath, [artist], [], [])
+        with thems.open_snapshot(self.filepath) as snapshot:
+            self.assertEqual(snapshot.students[0].get_values(), artist.get_values())
+
+        table = thems.ParticipantTable.from_participants([artist])
+        self.assertEqual(table.reference_date, (1, 1, 2030))
+        self.assertEqual(table.participant(0).get_values(), artist.get_values())
+
+    def test_not_a_snapshot(self):
+        with open(self.filepath, "wb") as f:
+            f.write(b"\0" * 256)
+        with self.assertRaises(ValueError):
+            thems.open_snapshot(self.filepath)
+
+
+if __name__ == "__main__":
+    unittest.main()
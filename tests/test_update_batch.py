@@ -0,0 +1,130 @@
+import copy
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Talent_Hunt_Event_Management_System as thems
+
+def make_roster(n: int = 60):
+    '''Returns (students, teachers) with every kind of Student'''
+    students = []
+    for i in range(n):
+        kind = i % 3
+        activity = ("Talent", "Sports", "Academic")[kind]
+        attributes = (f"S{i}", i, 2005, 1 + i % 12, 1 + i % 28, "Male", 5,
+                      "AB"[i % 2], 5.0 + (i % 50) / 10, activity,
+                      float(i % 97), float(i % 89), float(i % 83))
+        if kind == 0:
+            students.append(thems.Artist(*attributes, "Dance"))
+        elif kind == 1:
+            students.append(thems.Athlete(*attributes, "Run", 1.5))
+        else:
+            students.append(thems.Scholar(*attributes, "Math", [85.0, 60.0]))
+
+    teachers = [thems.Teacher(f"T{i}", 1000 + i, 1980, 1, 1, "Female", "Math",
+                              5, "A", True) for i in range(5)]
+    return (students, teachers)
+
+def make_updates(students, teachers) -> list:
+    '''Several updates per participant, including linked attributes'''
+    generator = random.Random(3)
+    updates = []
+    for student in students:
+        if isinstance(student, thems.Artist):
+            updates.append((student, {"talent_score": generator.uniform(0, 100)}))
+            updates.append((student, {"performance_level": generator.uniform(0, 100)}))
+        elif isinstance(student, thems.Scholar):
+            updates.append((student, {"gpa": generator.uniform(0, 10)}))
+            updates.append((student, {"olympiad_scores": [90.0]}))
+        else:
+            updates.append((student, {"birth_year": 2001, "birth_month": 2}))
+            updates.append((student, {"birth_day": 28, "name": f"R{student.idi}"}))
+    for teacher in teachers:
+        updates.append((teacher, {"judge": False, "mentor_grade": 3}))
+    return updates
+
+
+class UpdateBatchTest(unittest.TestCase):
+    def setUp(self):
+        self.students, self.teachers = make_roster()
+        self.participants = self.students + self.teachers
+        self.registry = thems.Registry(self.students, self.teachers)
+        self.show = thems.TalentShow(
+            1, "Show", "Talent", 1000, 5, True,
+            [s for s in self.students if isinstance(s, thems.Artist)], [], ["Dance"])
+        self.show.enable_leaderboard()
+        self.before = [p.get_values() for p in self.participants]
+
+    def values(self) -> list:
+        return [p.get_values() for p in self.participants]
+
+    def test_apply_matches_sequential_set_values(self):
+        updates = make_updates(self.students, self.teachers)
+
+        # The same updates one after the other on copies
+        copies = {id(p): copy.deepcopy(p) for p in self.participants}
+        for participant, data_attributes in updates:
+            copies[id(participant)].set_values(data_attributes)
+
+        batch = thems.UpdateBatch(updates)
+        self.assertEqual(batch.validate(), [])
+        self.assertIsNone(batch.apply())
+        self.assertEqual(self.values(),
+                         [copies[id(p)].get_values() for p in self.participants])
+        self.assertIs(self.show.determine_winner(),
+                      thems.winner_from_participants(self.show._Activity__participants))
+        self.assertEqual(batch.apply(), -1)
+
+    def test_rollback_restores_everything(self):
+        winner = self.show.determine_winner()
+        batch = thems.UpdateBatch(make_updates(self.students, self.teachers))
+        batch.apply()
+
+        self.assertIsNone(batch.rollback())
+        self.assertEqual(self.values(), self.before)
+        # Nothing stale is left in the caches, the leaderboard or the indexes
+        self.assertEqual([p._build_values() for p in self.participants], self.before)
+        self.assertIs(self.show.determine_winner(), winner)
+        self.assertEqual(set(self.registry.students(grade_level=5)), set(self.students))
+        self.assertEqual(batch.rollback(), -1)
+
+    def test_invalid_batch_changes_nothing(self):
+        batch = thems.UpdateBatch([(self.students[0], {"gpa": 1.0}),
+                                   (self.students[1], {"gpa": "bad"}),
+                                   (self.teachers[0], {"mentor_grade": 99})])
+        self.assertEqual(batch.validate(), [1, 2])
+        self.assertEqual(batch.apply(), -1)
+        self.assertEqual(self.values(), self.before)
+        self.assertEqual(batch.add(5, {}), -1)
+
+    def test_failure_during_apply_restores(self):
+        class Boom(Exception):
+            pass
+
+        batch = thems.UpdateBatch([(self.students[0], {"gpa": 9.0}),
+                                   (self.students[1], {"gpa": 8.0})])
+        original = thems.Student._update_derived
+        calls = []
+
+        def failing(student, data_attributes, changed, score_changed):
+            calls.append(student)
+            if len(calls) == 2:
+                # The second participant fails half way through the batch
+                raise Boom()
+            original(student, data_attributes, changed, score_changed)
+
+        thems.Student._update_derived = failing
+        try:
+            with self.assertRaises(Boom):
+                batch.apply()
+        finally:
+            thems.Student._update_derived = original
+
+        self.assertEqual(self.values(), self.before)
+
+
+if __name__ == "__main__":
+    unittest.main()